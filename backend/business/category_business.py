@@ -8,6 +8,7 @@ import logging
 # Imports corrigés pour correspondre à votre structure
 from models import Categorie, FluxCategorie
 from dtos.category_dto import CategoryCreateDTO, CategoryUpdateDTO, CategoryResponseDTO
+from core.cache import invalidate_user_search_cache
 
 logger = logging.getLogger(__name__)
 
@@ -63,18 +64,21 @@ class CategoryBusiness:
             Categorie.utilisateur_id == user_id
         ).order_by(Categorie.nom).all()
         
+        # Nombre de flux par catégorie en une seule requête
+        category_ids = [cat.id for cat in categories]
+        flux_counts = dict(
+            self.db.query(FluxCategorie.categorie_id, func.count(FluxCategorie.id)).filter(
+                FluxCategorie.categorie_id.in_(category_ids)
+            ).group_by(FluxCategorie.categorie_id).all()
+        ) if category_ids else {}
+        
         results = []
         for cat in categories:
-            # Compter les flux dans cette catégorie
-            flux_count = self.db.query(func.count(FluxCategorie.id)).filter(
-                FluxCategorie.categorie_id == cat.id
-            ).scalar() or 0
-            
             results.append(CategoryResponseDTO(
                 id=cat.id,
                 nom=cat.nom,
                 couleur=cat.couleur,
-                nombre_flux=flux_count,
+                nombre_flux=flux_counts.get(cat.id, 0),
                 cree_le=cat.cree_le
             ))
         
@@ -191,6 +195,7 @@ class CategoryBusiness:
             # Supprimer la catégorie
             self.db.delete(categorie)
             self.db.commit()
+            invalidate_user_search_cache(categorie.utilisateur_id)
             
         except Exception as e:
             self.db.rollback()
@@ -230,6 +235,13 @@ class CategoryBusiness:
             
             self.db.commit()
             
+            # Le filtre de recherche par catégorie de l'utilisateur a changé
+            user_id = self.db.query(Categorie.utilisateur_id).filter(
+                Categorie.id == to_category_id
+            ).scalar()
+            if user_id:
+                invalidate_user_search_cache(user_id)
+            
         except Exception as e:
             self.db.rollback()
             logger.error(f"Erreur lors du déplacement du flux: {e}")
@@ -25,6 +25,7 @@ from dtos.collection_dto import (
     CollectionMemberResponseDTO,
     CollectionFluxResponseDTO
 )
+from core.cache import invalidate_user_search_cache
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +38,14 @@ class CollectionBusiness:
     def create_collection(self, user_id: int, collection_data: CollectionCreateDTO) -> CollectionResponseDTO:
         """Créer une nouvelle collection"""
         try:
+            now = datetime.utcnow()
             collection = Collection(
                 nom=collection_data.nom,
                 proprietaire_id=user_id,
                 description=collection_data.description,
                 est_partagee=collection_data.est_partagee,
-                cree_le=datetime.utcnow(),
-                modifie_le=datetime.utcnow()
+                cree_le=now,
+                modifie_le=now
             )
             
             self.db.add(collection)
@@ -59,12 +61,13 @@ class CollectionBusiness:
                 peut_commenter=True,
                 peut_modifier=True,
                 peut_supprimer=True,
-                rejoint_le=datetime.utcnow()
+                rejoint_le=now
             )
             
             self.db.add(membre)
             self.db.commit()
             self.db.refresh(collection)
+            invalidate_user_search_cache(user_id)
             
             # Récupérer le nom du propriétaire
             proprietaire_nom = self.db.query(Utilisateur.nom_utilisateur).filter(
@@ -125,24 +128,31 @@ class CollectionBusiness:
         # Appliquer la pagination
         offset = (page - 1) * page_size
         collections = query.offset(offset).limit(page_size).all()
-        
+
+        # Compteurs et noms des propriétaires : une requête chacun
+        collection_ids = [c.id for c in collections]
+        nombres_flux = dict(
+            self.db.query(CollectionFlux.collection_id, func.count(CollectionFlux.id)).filter(
+                CollectionFlux.collection_id.in_(collection_ids)
+            ).group_by(CollectionFlux.collection_id).all()
+        ) if collection_ids else {}
+        nombres_membres = dict(
+            self.db.query(MembreCollection.collection_id, func.count(MembreCollection.id)).filter(
+                MembreCollection.collection_id.in_(collection_ids)
+            ).group_by(MembreCollection.collection_id).all()
+        ) if collection_ids else {}
+        proprietaire_ids = {c.proprietaire_id for c in collections}
+        proprietaire_noms = dict(
+            self.db.query(Utilisateur.id, Utilisateur.nom_utilisateur).filter(
+                Utilisateur.id.in_(proprietaire_ids)
+            ).all()
+        ) if proprietaire_ids else {}
+
         # Convertir en DTOs
         results = []
         for collection in collections:
-            # Compter flux et membres
-            nombre_flux = self.db.query(func.count(CollectionFlux.id)).filter(
-                CollectionFlux.collection_id == collection.id
-            ).scalar() or 0
-            
-            nombre_membres = self.db.query(func.count(MembreCollection.id)).filter(
-                MembreCollection.collection_id == collection.id
-            ).scalar() or 0
-            
-            # Récupérer le nom du propriétaire
-            proprietaire_nom = self.db.query(Utilisateur.nom_utilisateur).filter(
-                Utilisateur.id == collection.proprietaire_id
-            ).scalar() or "Utilisateur inconnu"
-            
+            proprietaire_nom = proprietaire_noms.get(collection.proprietaire_id) or "Utilisateur inconnu"
+
             results.append(CollectionResponseDTO(
                 id=collection.id,
                 nom=collection.nom,
@@ -150,8 +160,8 @@ class CollectionBusiness:
                 est_partagee=collection.est_partagee,
                 proprietaire_id=collection.proprietaire_id,
                 proprietaire_nom=proprietaire_nom,
-                nombre_flux=nombre_flux,
-                nombre_membres=nombre_membres,
+                nombre_flux=nombres_flux.get(collection.id, 0),
+                nombre_membres=nombres_membres.get(collection.id, 0),
                 cree_le=collection.cree_le,
                 modifie_le=collection.modifie_le
             ))
@@ -344,6 +354,7 @@ class CollectionBusiness:
             
             self.db.commit()
             self.db.refresh(collection)
+            invalidate_user_search_cache(*self._collection_user_ids(collection.id))
             
             # Compter flux et membres
             nombre_flux = self.db.query(func.count(CollectionFlux.id)).filter(
@@ -387,8 +398,12 @@ class CollectionBusiness:
             if not collection:
                 raise ValueError("Collection non trouvée")
             
+            # Membres lus avant la suppression en cascade
+            user_ids = self._collection_user_ids(collection_id)
+            
             self.db.delete(collection)
             self.db.commit()
+            invalidate_user_search_cache(*user_ids)
             
         except Exception as e:
             self.db.rollback()
@@ -416,6 +431,7 @@ class CollectionBusiness:
             
             self.db.add(collection_flux)
             self.db.commit()
+            invalidate_user_search_cache(*self._collection_user_ids(collection_id))
             
         except Exception as e:
             self.db.rollback()
@@ -433,6 +449,7 @@ class CollectionBusiness:
             if collection_flux:
                 self.db.delete(collection_flux)
                 self.db.commit()
+                invalidate_user_search_cache(*self._collection_user_ids(collection_id))
                 
         except Exception as e:
             self.db.rollback()
@@ -472,6 +489,7 @@ class CollectionBusiness:
             self.db.add(membre)
             self.db.commit()
             self.db.refresh(membre)
+            invalidate_user_search_cache(*self._collection_user_ids(collection_id))
             
             # Récupérer les infos utilisateur
             user_info = self.db.query(
@@ -588,8 +606,11 @@ class CollectionBusiness:
             ).first()
             
             if membre:
+                # Le membre retiré ne doit plus trouver la collection en recherche
+                user_ids = self._collection_user_ids(membre.collection_id)
                 self.db.delete(membre)
                 self.db.commit()
+                invalidate_user_search_cache(*user_ids)
                 
         except Exception as e:
             self.db.rollback()
@@ -647,6 +668,7 @@ class CollectionBusiness:
             
             self.db.commit()
             self.db.refresh(collection)
+            invalidate_user_search_cache(*self._collection_user_ids(collection.id))
             
             # Compter flux et membres
             nombre_flux = self.db.query(func.count(CollectionFlux.id)).filter(
@@ -686,6 +708,20 @@ class CollectionBusiness:
         # Pour l'instant, on retourne une liste vide
         return []
     
+    def _collection_user_ids(self, collection_id: int) -> List[int]:
+        """Propriétaire et membres d'une collection (dont les recherches la voient)"""
+        member_ids = [
+            user_id for (user_id,) in self.db.query(MembreCollection.utilisateur_id).filter(
+                MembreCollection.collection_id == collection_id
+            )
+        ]
+        owner_id = self.db.query(Collection.proprietaire_id).filter(
+            Collection.id == collection_id
+        ).scalar()
+        if owner_id is not None:
+            member_ids.append(owner_id)
+        return member_ids
+    
     def _get_default_permissions(self, role: str) -> Dict[str, bool]:
         """Obtenir les permissions par défaut selon le rôle"""
         if role == 'proprietaire':
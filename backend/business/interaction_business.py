@@ -2,7 +2,9 @@
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, func, tuple_, update
+import heapq
+import itertools
 import logging
 
 # Imports corrigés pour correspondre à votre structure
@@ -13,7 +15,8 @@ from models import (
     Article,
     Collection,
     CollectionFlux,
-    MembreCollection
+    MembreCollection,
+    t_vue_activite_recente
 )
 from dtos.interaction_dto import (
     CommentCreateDTO,
@@ -22,6 +25,7 @@ from dtos.interaction_dto import (
     MessageCreateDTO,
     MessageResponseDTO
 )
+from core.cache import invalidate_user_search_cache
 
 logger = logging.getLogger(__name__)
 
@@ -34,19 +38,20 @@ class InteractionBusiness:
     def create_comment(self, user_id: int, comment_data: CommentCreateDTO) -> CommentResponseDTO:
         """Créer un nouveau commentaire"""
         try:
+            now = datetime.utcnow()
             comment = CommentaireArticle(
                 article_id=comment_data.article_id,
                 utilisateur_id=user_id,
                 collection_id=comment_data.collection_id,
                 contenu=comment_data.contenu,
                 commentaire_parent_id=comment_data.commentaire_parent_id,
-                cree_le=datetime.utcnow(),
-                modifie_le=datetime.utcnow()
+                cree_le=now,
+                modifie_le=now
             )
             
             self.db.add(comment)
             self.db.commit()
-            self.db.refresh(comment)
+            self._invalidate_collection_search_cache(comment.collection_id)
             
             # Récupérer le nom de l'utilisateur
             utilisateur_nom = self.db.query(Utilisateur.nom_utilisateur).filter(
@@ -86,9 +91,7 @@ class InteractionBusiness:
     
     def get_comment_by_id(self, comment_id: int) -> Optional[CommentaireArticle]:
         """Récupérer un commentaire par son ID"""
-        return self.db.query(CommentaireArticle).filter(
-            CommentaireArticle.id == comment_id
-        ).first()
+        return self.db.get(CommentaireArticle, comment_id)
     
     def notify_new_comment(self, comment_id: int, collection_id: int, author_id: int):
         """Log du nouveau commentaire (sans notifications en BDD)"""
@@ -96,8 +99,8 @@ class InteractionBusiness:
     
     def get_article_comments(self, article_id: int, collection_id: int) -> List[CommentResponseDTO]:
         """Récupérer tous les commentaires d'un article avec leurs réponses"""
-        # Récupérer les commentaires principaux (sans parent)
-        main_comments = self.db.query(
+        # Récupérer commentaires principaux et réponses en une seule requête
+        comments = self.db.query(
             CommentaireArticle.id,
             CommentaireArticle.article_id,
             CommentaireArticle.utilisateur_id,
@@ -106,33 +109,17 @@ class InteractionBusiness:
             CommentaireArticle.commentaire_parent_id,
             CommentaireArticle.cree_le,
             CommentaireArticle.modifie_le,
+            CommentaireArticle.est_modifie,
             Utilisateur.nom_utilisateur
         ).join(
             Utilisateur, CommentaireArticle.utilisateur_id == Utilisateur.id
         ).filter(
             CommentaireArticle.article_id == article_id,
-            CommentaireArticle.collection_id == collection_id,
-            CommentaireArticle.commentaire_parent_id.is_(None)
+            CommentaireArticle.collection_id == collection_id
         ).order_by(CommentaireArticle.cree_le.asc()).all()
         
-        # Récupérer toutes les réponses
-        replies = self.db.query(
-            CommentaireArticle.id,
-            CommentaireArticle.article_id,
-            CommentaireArticle.utilisateur_id,
-            CommentaireArticle.collection_id,
-            CommentaireArticle.contenu,
-            CommentaireArticle.commentaire_parent_id,
-            CommentaireArticle.cree_le,
-            CommentaireArticle.modifie_le,
-            Utilisateur.nom_utilisateur
-        ).join(
-            Utilisateur, CommentaireArticle.utilisateur_id == Utilisateur.id
-        ).filter(
-            CommentaireArticle.article_id == article_id,
-            CommentaireArticle.collection_id == collection_id,
-            CommentaireArticle.commentaire_parent_id.is_not(None)
-        ).order_by(CommentaireArticle.cree_le.asc()).all()
+        main_comments = [c for c in comments if c.commentaire_parent_id is None]
+        replies = [c for c in comments if c.commentaire_parent_id is not None]
         
         # Organiser les réponses par commentaire parent
         replies_by_parent = {}
@@ -141,9 +128,6 @@ class InteractionBusiness:
             if parent_id not in replies_by_parent:
                 replies_by_parent[parent_id] = []
             
-            # Vérifier si le commentaire a été modifié
-            est_modifie = reply.modifie_le and reply.modifie_le > reply.cree_le
-            
             replies_by_parent[parent_id].append(CommentResponseDTO(
                 id=reply.id,
                 article_id=reply.article_id,
@@ -152,7 +136,7 @@ class InteractionBusiness:
                 collection_id=reply.collection_id,
                 contenu=reply.contenu,
                 commentaire_parent_id=reply.commentaire_parent_id,
-                est_modifie=est_modifie,
+                est_modifie=reply.est_modifie,
                 cree_le=reply.cree_le,
                 modifie_le=reply.modifie_le,
                 reponses=[]
@@ -161,9 +145,6 @@ class InteractionBusiness:
         # Construire la liste des commentaires avec leurs réponses
         result = []
         for comment in main_comments:
-            # Vérifier si le commentaire a été modifié
-            est_modifie = comment.modifie_le and comment.modifie_le > comment.cree_le
-            
             comment_dto = CommentResponseDTO(
                 id=comment.id,
                 article_id=comment.article_id,
@@ -172,7 +153,7 @@ class InteractionBusiness:
                 collection_id=comment.collection_id,
                 contenu=comment.contenu,
                 commentaire_parent_id=comment.commentaire_parent_id,
-                est_modifie=est_modifie,
+                est_modifie=comment.est_modifie,
                 cree_le=comment.cree_le,
                 modifie_le=comment.modifie_le,
                 reponses=replies_by_parent.get(comment.id, [])
@@ -184,9 +165,7 @@ class InteractionBusiness:
     def update_comment(self, comment_id: int, comment_update: CommentUpdateDTO) -> CommentResponseDTO:
         """Mettre à jour un commentaire"""
         try:
-            comment = self.db.query(CommentaireArticle).filter(
-                CommentaireArticle.id == comment_id
-            ).first()
+            comment = self.db.get(CommentaireArticle, comment_id)
             
             if not comment:
                 raise ValueError("Commentaire non trouvé")
@@ -195,7 +174,7 @@ class InteractionBusiness:
             comment.modifie_le = datetime.utcnow()
             
             self.db.commit()
-            self.db.refresh(comment)
+            self._invalidate_collection_search_cache(comment.collection_id)
             
             # Récupérer le nom de l'utilisateur
             utilisateur_nom = self.db.query(Utilisateur.nom_utilisateur).filter(
@@ -224,17 +203,20 @@ class InteractionBusiness:
     def soft_delete_comment(self, comment_id: int):
         """Suppression logique d'un commentaire"""
         try:
-            comment = self.db.query(CommentaireArticle).filter(
-                CommentaireArticle.id == comment_id
-            ).first()
+            # Marquer le commentaire comme supprimé en modifiant son contenu (UPDATE unique)
+            collection_id = self.db.execute(
+                update(CommentaireArticle).where(
+                    CommentaireArticle.id == comment_id
+                ).values(
+                    contenu="[Commentaire supprimé]",
+                    modifie_le=datetime.utcnow()
+                ).returning(CommentaireArticle.collection_id)
+            ).scalar()
+            
+            self.db.commit()
+            if collection_id is not None:
+                self._invalidate_collection_search_cache(collection_id)
             
-            if comment:
-                # Marquer le commentaire comme supprimé en modifiant son contenu
-                comment.contenu = "[Commentaire supprimé]"
-                comment.modifie_le = datetime.utcnow()
-                
-                self.db.commit()
-                
         except Exception as e:
             self.db.rollback()
             logger.error(f"Erreur lors de la suppression du commentaire: {e}")
@@ -243,17 +225,17 @@ class InteractionBusiness:
     def create_message(self, user_id: int, message_data: MessageCreateDTO) -> MessageResponseDTO:
         """Créer un nouveau message dans une collection"""
         try:
+            now = datetime.utcnow()
             message = MessageCollection(
                 collection_id=message_data.collection_id,
                 utilisateur_id=user_id,
                 contenu=message_data.contenu,
-                cree_le=datetime.utcnow(),
-                modifie_le=datetime.utcnow()
+                cree_le=now,
+                modifie_le=now
             )
             
             self.db.add(message)
             self.db.commit()
-            self.db.refresh(message)
             
             # Récupérer le nom de l'utilisateur
             utilisateur_nom = self.db.query(Utilisateur.nom_utilisateur).filter(
@@ -280,50 +262,72 @@ class InteractionBusiness:
         self, 
         collection_id: int, 
         page: int = 1, 
-        page_size: int = 50
-    ) -> Tuple[List[MessageResponseDTO], int]:
-        """Récupérer les messages d'une collection avec pagination"""
+        page_size: int = 50,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None
+    ) -> Tuple[List[MessageResponseDTO], Optional[int], bool]:
+        """
+        Récupérer les messages d'une collection avec pagination.
+        Si before et before_id (cree_le et id du dernier message reçu) sont
+        fournis, la pagination se fait par curseur au lieu d'un OFFSET.
+        Retourne (messages, total, has_more) ; total vaut None avec un curseur.
+        """
+        use_cursor = before is not None and before_id is not None
         
-        # Compter le total
-        total = self.db.query(func.count(MessageCollection.id)).filter(
-            MessageCollection.collection_id == collection_id
-        ).scalar() or 0
+        # Compter le total (inutile en pagination par curseur)
+        total = None
+        if not use_cursor:
+            total = self.db.query(func.count(MessageCollection.id)).filter(
+                MessageCollection.collection_id == collection_id
+            ).scalar() or 0
         
         # Récupérer les messages avec pagination
-        offset = (page - 1) * page_size
-        messages = self.db.query(
+        query = self.db.query(
             MessageCollection.id,
             MessageCollection.collection_id,
             MessageCollection.utilisateur_id,
             MessageCollection.contenu,
             MessageCollection.cree_le,
             MessageCollection.modifie_le,
+            MessageCollection.est_modifie,
             Utilisateur.nom_utilisateur
         ).join(
             Utilisateur, MessageCollection.utilisateur_id == Utilisateur.id
         ).filter(
             MessageCollection.collection_id == collection_id
         ).order_by(
-            MessageCollection.cree_le.desc()
-        ).offset(offset).limit(page_size).all()
+            # L'id départage les messages envoyés au même instant
+            MessageCollection.cree_le.desc(),
+            MessageCollection.id.desc()
+        )
+        
+        if use_cursor:
+            query = query.filter(
+                tuple_(MessageCollection.cree_le, MessageCollection.id) < (before, before_id)
+            )
+        else:
+            query = query.offset((page - 1) * page_size)
+        
+        # Une ligne de plus pour savoir s'il reste des messages
+        messages = query.limit(page_size + 1).all()
+        has_more = len(messages) > page_size
+        messages = messages[:page_size]
         
         # Convertir en DTOs
         result = []
         for msg in messages:
-            est_modifie = msg.modifie_le and msg.modifie_le > msg.cree_le
-            
             result.append(MessageResponseDTO(
                 id=msg.id,
                 collection_id=msg.collection_id,
                 utilisateur_id=msg.utilisateur_id,
                 utilisateur_nom=msg.nom_utilisateur,
                 contenu=msg.contenu,
-                est_modifie=est_modifie,
+                est_modifie=msg.est_modifie,
                 cree_le=msg.cree_le,
                 modifie_le=msg.modifie_le
             ))
         
-        return result, total
+        return result, total, has_more
     
     def get_user_comments(
         self, 
@@ -341,6 +345,7 @@ class InteractionBusiness:
             CommentaireArticle.commentaire_parent_id,
             CommentaireArticle.cree_le,
             CommentaireArticle.modifie_le,
+            CommentaireArticle.est_modifie,
             Utilisateur.nom_utilisateur
         ).join(
             Utilisateur, CommentaireArticle.utilisateur_id == Utilisateur.id
@@ -352,8 +357,6 @@ class InteractionBusiness:
         
         result = []
         for comment in comments:
-            est_modifie = comment.modifie_le and comment.modifie_le > comment.cree_le
-            
             result.append(CommentResponseDTO(
                 id=comment.id,
                 article_id=comment.article_id,
@@ -362,7 +365,7 @@ class InteractionBusiness:
                 collection_id=comment.collection_id,
                 contenu=comment.contenu,
                 commentaire_parent_id=comment.commentaire_parent_id,
-                est_modifie=est_modifie,
+                est_modifie=comment.est_modifie,
                 cree_le=comment.cree_le,
                 modifie_le=comment.modifie_le,
                 reponses=[]
@@ -377,80 +380,54 @@ class InteractionBusiness:
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """Récupérer l'activité récente (commentaires et messages)"""
-        activities = []
+        activite = t_vue_activite_recente
         
-        # Récupérer les commentaires récents
-        comments_query = self.db.query(
-            CommentaireArticle.id,
-            CommentaireArticle.contenu,
-            CommentaireArticle.cree_le,
-            CommentaireArticle.collection_id,
-            CommentaireArticle.article_id,
-            Utilisateur.nom_utilisateur
-        ).join(
-            Utilisateur, CommentaireArticle.utilisateur_id == Utilisateur.id
-        ).join(
-            MembreCollection, and_(
-                MembreCollection.collection_id == CommentaireArticle.collection_id,
-                MembreCollection.utilisateur_id == user_id
+        def recent_activities(activity_type: str):
+            # L'extrait du contenu est calculé par la vue vue_activite_recente
+            query = self.db.query(activite).join(
+                MembreCollection, and_(
+                    MembreCollection.collection_id == activite.c.collection_id,
+                    MembreCollection.utilisateur_id == user_id
+                )
+            ).filter(
+                activite.c.type == activity_type
             )
-        )
-        
-        if collection_id:
-            comments_query = comments_query.filter(
-                CommentaireArticle.collection_id == collection_id
-            )
-        
-        recent_comments = comments_query.order_by(
-            CommentaireArticle.cree_le.desc()
-        ).limit(limit // 2).all()
+            
+            if collection_id:
+                query = query.filter(activite.c.collection_id == collection_id)
+            
+            rows = query.order_by(activite.c.cree_le.desc()).limit(limit // 2).all()
+            
+            for row in rows:
+                item = {
+                    "type": row.type,
+                    "id": row.id,
+                    "contenu": row.contenu_extrait,
+                    "utilisateur": row.utilisateur,
+                    "collection_id": row.collection_id
+                }
+                if activity_type == "comment":
+                    item["article_id"] = row.article_id
+                item["date"] = row.cree_le
+                yield item
         
-        for comment in recent_comments:
-            activities.append({
-                "type": "comment",
-                "id": comment.id,
-                "contenu": comment.contenu[:100] + "..." if len(comment.contenu) > 100 else comment.contenu,
-                "utilisateur": comment.nom_utilisateur,
-                "collection_id": comment.collection_id,
-                "article_id": comment.article_id,
-                "date": comment.cree_le
-            })
+        comment_activities = recent_activities("comment")
+        message_activities = recent_activities("message")
         
-        # Récupérer les messages récents
-        messages_query = self.db.query(
-            MessageCollection.id,
-            MessageCollection.contenu,
-            MessageCollection.cree_le,
-            MessageCollection.collection_id,
-            Utilisateur.nom_utilisateur
-        ).join(
-            Utilisateur, MessageCollection.utilisateur_id == Utilisateur.id
-        ).join(
-            MembreCollection, and_(
-                MembreCollection.collection_id == MessageCollection.collection_id,
-                MembreCollection.utilisateur_id == user_id
-            )
+        # Les deux sources sont déjà triées par date décroissante : simple fusion
+        activities = heapq.merge(
+            comment_activities,
+            message_activities,
+            key=lambda x: x["date"],
+            reverse=True
         )
-        
-        if collection_id:
-            messages_query = messages_query.filter(
-                MessageCollection.collection_id == collection_id
-            )
-        
-        recent_messages = messages_query.order_by(
-            MessageCollection.cree_le.desc()
-        ).limit(limit // 2).all()
-        
-        for message in recent_messages:
-            activities.append({
-                "type": "message",
-                "id": message.id,
-                "contenu": message.contenu[:100] + "..." if len(message.contenu) > 100 else message.contenu,
-                "utilisateur": message.nom_utilisateur,
-                "collection_id": message.collection_id,
-                "date": message.cree_le
-            })
-        
-        # Trier par date et limiter
-        activities.sort(key=lambda x: x["date"], reverse=True)
-        return activities[:limit]
\ No newline at end of file
+        return list(itertools.islice(activities, limit))
+    
+    def _invalidate_collection_search_cache(self, collection_id: int):
+        """Invalide les recherches des membres de la collection (commentaires visibles)"""
+        user_ids = self.db.query(MembreCollection.utilisateur_id).filter(
+            MembreCollection.collection_id == collection_id
+        ).union(
+            self.db.query(Collection.proprietaire_id).filter(Collection.id == collection_id)
+        ).all()
+        invalidate_user_search_cache(*(user_id for (user_id,) in user_ids))
@@ -1,13 +1,16 @@
 # business/rss_business.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List, Optional, Tuple, Dict, Any
 from datetime import datetime, timedelta
 import feedparser
-import xml.etree.ElementTree as ET
+import httpx
+from lxml import etree
+import io
 import logging
 import hashlib
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Imports corrigés pour correspondre à votre structure de modèles
 from models import (
@@ -26,27 +29,34 @@ from dtos.rss_dto import (
     ArticleResponseDTO,
     ArticleFilterDTO
 )
+from core.cache import invalidate_search_cache, invalidate_user_search_cache
+from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Nom provisoire d'un flux créé sans avoir été téléchargé
+DEFAULT_FLUX_NOM = 'Flux sans titre'
+
 class RssBusiness:
     """Logique métier pour la gestion des flux RSS"""
     
     def __init__(self, db: Session):
         self.db = db
+        # Catégorie par défaut "Général" déjà résolue, par utilisateur
+        self._default_categorie_ids: Dict[int, int] = {}
     
     def flux_exists_for_user(self, user_id: int, url: str) -> bool:
         """Vérifie si un flux existe déjà pour un utilisateur"""
-        exists = self.db.query(FluxRss).join(
+        query = self.db.query(FluxRss.id).join(
             FluxCategorie
         ).join(
             Categorie
         ).filter(
             Categorie.utilisateur_id == user_id,
             FluxRss.url == url
-        ).first()
+        )
         
-        return exists is not None
+        return self.db.query(query.exists()).scalar()
     
     def create_flux(self, user_id: int, flux_data: FluxCreateDTO) -> FluxResponseDTO:
         """Crée un nouveau flux RSS pour l'utilisateur"""
@@ -54,71 +64,52 @@ class RssBusiness:
             # Vérifier si le flux existe déjà globalement
             flux = self.db.query(FluxRss).filter(FluxRss.url == str(flux_data.url)).first()
             
-            if not flux:
-                # Parser le flux pour obtenir les informations
-                feed_info = self._parse_feed_info(str(flux_data.url))
-                
-                # Créer le nouveau flux
-                flux = FluxRss(
-                    nom=flux_data.nom_personnalise or feed_info.get('title', 'Flux sans titre'),
-                    url=str(flux_data.url),
-                    description=feed_info.get('description', ''),
-                    frequence_maj_heures=flux_data.frequence_maj_heures,
-                    est_actif=True,
-                    derniere_maj=datetime.utcnow(),
-                    cree_le=datetime.utcnow(),
-                    modifie_le=datetime.utcnow()
-                )
-                self.db.add(flux)
-                self.db.flush()
-            
             # Obtenir ou créer la catégorie
             if flux_data.categorie_id:
                 # Vérifier que la catégorie appartient à l'utilisateur
-                categorie = self.db.query(Categorie).filter(
+                categorie_ok = self.db.query(self.db.query(Categorie.id).filter(
                     Categorie.id == flux_data.categorie_id,
                     Categorie.utilisateur_id == user_id
-                ).first()
+                ).exists()).scalar()
                 
-                if not categorie:
+                if not categorie_ok:
                     raise ValueError("Catégorie non trouvée ou non autorisée")
                     
                 categorie_id = flux_data.categorie_id
             else:
                 # Utiliser la catégorie par défaut "Général"
-                categorie = self.db.query(Categorie).filter(
-                    Categorie.utilisateur_id == user_id,
-                    Categorie.nom == "Général"
-                ).first()
-                
-                if not categorie:
-                    # Créer la catégorie par défaut si elle n'existe pas
-                    categorie = Categorie(
-                        nom="Général",
-                        utilisateur_id=user_id,
-                        couleur="#007bff",
-                        cree_le=datetime.utcnow()
-                    )
-                    self.db.add(categorie)
-                    self.db.flush()
-                
-                categorie_id = categorie.id
+                categorie_id = self._get_default_categorie_id(user_id)
             
-            # Vérifier si l'association n'existe pas déjà
-            existing_association = self.db.query(FluxCategorie).filter(
-                FluxCategorie.flux_id == flux.id,
-                FluxCategorie.categorie_id == categorie_id
-            ).first()
+            if not flux:
+                # Créer le nouveau flux sans le télécharger : titre et
+                # description sont complétés à la première récupération
+                now = datetime.utcnow()
+                flux = FluxRss(
+                    nom=flux_data.nom_personnalise or DEFAULT_FLUX_NOM,
+                    url=str(flux_data.url),
+                    frequence_maj_heures=flux_data.frequence_maj_heures,
+                    est_actif=True,
+                    derniere_maj=now,
+                    cree_le=now,
+                    modifie_le=now
+                )
+                self.db.add(flux)
+                self.db.flush()
+                # Un flux qui vient d'être créé n'a encore aucune association
+                link_needed = True
+            else:
+                # Vérifier si l'association n'existe pas déjà
+                link_needed = not self.db.query(self.db.query(FluxCategorie.id).filter(
+                    FluxCategorie.flux_id == flux.id,
+                    FluxCategorie.categorie_id == categorie_id
+                ).exists()).scalar()
             
-            if not existing_association:
+            if link_needed:
                 # Associer le flux à la catégorie de l'utilisateur
-                flux_cat = FluxCategorie(
-                    flux_id=flux.id,
-                    categorie_id=categorie_id
-                )
-                self.db.add(flux_cat)
+                self.db.add(FluxCategorie(flux_id=flux.id, categorie_id=categorie_id))
             
             self.db.commit()
+            invalidate_user_search_cache(user_id)
             
             # Retourner le DTO
             return FluxResponseDTO(
@@ -135,78 +126,29 @@ class RssBusiness:
             
         except Exception as e:
             self.db.rollback()
+            # Une catégorie créée dans la transaction annulée n'existe plus
+            self._default_categorie_ids.clear()
             logger.error(f"Erreur lors de la création du flux: {e}")
             raise
     
     def fetch_flux_articles(self, flux_id: int) -> int:
-        """Récupère les articles d'un flux RSS"""
+        """
+        Récupère les articles d'un flux RSS.
+        En cas d'échec, la tentative est enregistrée puis l'erreur propagée.
+        """
         try:
             flux = self.db.query(FluxRss).filter(FluxRss.id == flux_id).first()
             if not flux:
                 return 0
             
-            feed = feedparser.parse(flux.url)
-            new_articles = 0
-            
-            for entry in feed.entries:
-                # Générer un GUID unique
-                guid = entry.get('id', entry.get('link', ''))
-                if not guid:
-                    guid_content = f"{entry.get('title', '')}{entry.get('published', '')}"
-                    guid = hashlib.md5(guid_content.encode()).hexdigest()
-                
-                guid = guid[:500]
-                
-                # Vérifier si l'article existe déjà
-                exists = self.db.query(Article).filter(
-                    Article.flux_id == flux_id,
-                    Article.guid == guid
-                ).first()
-                
-                if not exists:
-                    # Parser la date
-                    publie_le = None
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        try:
-                            publie_le = datetime.fromtimestamp(time.mktime(entry.published_parsed))
-                        except:
-                            publie_le = datetime.utcnow()
-                    else:
-                        publie_le = datetime.utcnow()
-                    
-                    # Extraire le contenu
-                    contenu = None
-                    if hasattr(entry, 'content') and entry.content:
-                        contenu = entry.content[0].get('value', '')
-                    
-                    article = Article(
-                        flux_id=flux_id,
-                        titre=entry.get('title', 'Sans titre')[:500],
-                        lien=entry.get('link', ''),
-                        guid=guid,
-                        auteur=entry.get('author', '')[:255] if entry.get('author') else None,
-                        contenu=contenu,
-                        resume=entry.get('summary', ''),
-                        publie_le=publie_le,
-                        recupere_le=datetime.utcnow(),
-                        modifie_le=datetime.utcnow()
-                    )
-                    
-                    self.db.add(article)
-                    new_articles += 1
-            
-            # Mettre à jour la date de dernière MAJ
-            flux.derniere_maj = datetime.utcnow()
-            flux.modifie_le = datetime.utcnow()
-            self.db.commit()
-            
-            logger.info(f"Ajouté {new_articles} articles pour le flux {flux_id}")
-            return new_articles
+            feed = self._download_and_parse(flux.url, flux.etag, flux.last_modified)
+            return self._persist_entries(flux, feed)
             
         except Exception as e:
             self.db.rollback()
             logger.error(f"Erreur lors de la récupération des articles: {e}")
-            return 0
+            self._record_failed_fetch(flux_id)
+            raise
     
     def get_user_flux(
         self,
@@ -215,7 +157,10 @@ class RssBusiness:
         est_actif: Optional[bool] = None
     ) -> List[FluxResponseDTO]:
         """Récupère les flux de l'utilisateur"""
-        query = self.db.query(FluxRss).join(
+        query = self.db.query(
+            FluxRss,
+            self._article_count_column()
+        ).join(
             FluxCategorie
         ).join(
             Categorie
@@ -232,12 +177,7 @@ class RssBusiness:
         flux_list = query.all()
         
         results = []
-        for flux in flux_list:
-            # Compter les articles
-            nombre_articles = self.db.query(func.count(Article.id)).filter(
-                Article.flux_id == flux.id
-            ).scalar() or 0
-            
+        for flux, nombre_articles in flux_list:
             results.append(FluxResponseDTO(
                 id=flux.id,
                 nom=flux.nom,
@@ -254,14 +194,15 @@ class RssBusiness:
     
     def get_flux_by_id(self, flux_id: int) -> Optional[FluxResponseDTO]:
         """Récupère un flux par son ID"""
-        flux = self.db.query(FluxRss).filter(FluxRss.id == flux_id).first()
+        row = self.db.query(
+            FluxRss,
+            self._article_count_column()
+        ).filter(FluxRss.id == flux_id).first()
         
-        if not flux:
+        if not row:
             return None
         
-        nombre_articles = self.db.query(func.count(Article.id)).filter(
-            Article.flux_id == flux.id
-        ).scalar() or 0
+        flux, nombre_articles = row
         
         return FluxResponseDTO(
             id=flux.id,
@@ -277,22 +218,27 @@ class RssBusiness:
     
     def user_owns_flux(self, user_id: int, flux_id: int) -> bool:
         """Vérifie si un utilisateur possède un flux"""
-        exists = self.db.query(FluxCategorie).join(
+        query = self.db.query(FluxCategorie.id).join(
             Categorie
         ).filter(
             Categorie.utilisateur_id == user_id,
             FluxCategorie.flux_id == flux_id
-        ).first()
+        )
         
-        return exists is not None
+        return self.db.query(query.exists()).scalar()
     
     def update_flux(self, flux_id: int, flux_update: FluxUpdateDTO) -> FluxResponseDTO:
         """Met à jour un flux"""
-        flux = self.db.query(FluxRss).filter(FluxRss.id == flux_id).first()
+        # Le nombre d'articles, inchangé par la mise à jour, est lu avec le flux
+        row = self.db.query(FluxRss, self._article_count_column()).filter(
+            FluxRss.id == flux_id
+        ).first()
         
-        if not flux:
+        if not row:
             raise ValueError("Flux non trouvé")
         
+        flux, nombre_articles = row
+        
         if flux_update.nom:
             flux.nom = flux_update.nom
         if flux_update.description is not None:
@@ -304,10 +250,8 @@ class RssBusiness:
         
         flux.modifie_le = datetime.utcnow()
         self.db.commit()
-        
-        nombre_articles = self.db.query(func.count(Article.id)).filter(
-            Article.flux_id == flux.id
-        ).scalar() or 0
+        # Le flux est partagé par tous ses abonnés
+        invalidate_search_cache()
         
         return FluxResponseDTO(
             id=flux.id,
@@ -317,7 +261,7 @@ class RssBusiness:
             frequence_maj_heures=flux.frequence_maj_heures,
             est_actif=flux.est_actif,
             derniere_maj=flux.derniere_maj,
-            nombre_articles=nombre_articles,
+            nombre_articles=nombre_articles or 0,
             cree_le=flux.cree_le
         )
     
@@ -325,22 +269,39 @@ class RssBusiness:
         """Supprime un flux (retire l'association avec l'utilisateur)"""
         # Note: On ne supprime pas le flux lui-même, juste l'association
         # Le flux pourrait être utilisé par d'autres utilisateurs
-        flux_cats = self.db.query(FluxCategorie).filter(FluxCategorie.flux_id == flux_id).all()
-        
-        for fc in flux_cats:
-            self.db.delete(fc)
+        self.db.query(FluxCategorie).filter(
+            FluxCategorie.flux_id == flux_id
+        ).delete(synchronize_session=False)
         
         self.db.commit()
+        invalidate_search_cache()
+    
+    def get_flux_ids_to_update(self) -> List[int]:
+        """Retourne les flux actifs dont la fréquence de mise à jour est échue"""
+        now = datetime.utcnow()
+        rows = self.db.query(FluxRss.id).filter(
+            FluxRss.est_actif == True,
+            or_(
+                FluxRss.derniere_maj.is_(None),
+                FluxRss.derniere_maj <= now - func.make_interval(
+                    0, 0, 0, 0, FluxRss.frequence_maj_heures
+                )
+            )
+        ).all()
+        
+        return [flux_id for (flux_id,) in rows]
     
     def can_refresh_flux(self, flux_id: int) -> bool:
         """Vérifie si un flux peut être rafraîchi"""
-        flux = self.db.query(FluxRss).filter(FluxRss.id == flux_id).first()
+        derniere_maj = self.db.query(FluxRss.derniere_maj).filter(
+            FluxRss.id == flux_id
+        ).scalar()
         
-        if not flux or not flux.derniere_maj:
+        if not derniere_maj:
             return True
         
         # Vérifier si assez de temps s'est écoulé depuis la dernière MAJ
-        delta = datetime.utcnow() - flux.derniere_maj
+        delta = datetime.utcnow() - derniere_maj
         min_interval = timedelta(minutes=5)  # Minimum 5 minutes entre les MAJ
         
         return delta >= min_interval
@@ -351,54 +312,40 @@ class RssBusiness:
         filters: ArticleFilterDTO,
         sort_by: Optional[str] = None,
         sort_order: str = "desc"
-    ) -> Tuple[List[ArticleResponseDTO], int]:
-        """Récupère les articles de l'utilisateur avec filtres"""
-        # Requête de base
-        query = self.db.query(Article).join(
-            FluxRss, Article.flux_id == FluxRss.id
-        ).join(
-            FluxCategorie, FluxRss.id == FluxCategorie.flux_id
-        ).join(
-            Categorie, FluxCategorie.categorie_id == Categorie.id
-        ).filter(
-            Categorie.utilisateur_id == user_id
-        )
+    ) -> Tuple[List[ArticleResponseDTO], Optional[int], bool]:
+        """
+        Récupère les articles de l'utilisateur avec filtres.
+        Retourne (articles, total, has_more). Si filters.before_date et
+        filters.before_id sont fournis, la pagination se fait par curseur
+        (tri par date décroissante) et le total n'est pas calculé (None).
+        """
+        # Filtres communs à la liste et au comptage
+        conditions = [Categorie.utilisateur_id == user_id]
         
-        # Appliquer les filtres
         if filters.categorie_id:
-            query = query.filter(Categorie.id == filters.categorie_id)
+            conditions.append(Categorie.id == filters.categorie_id)
         
         if filters.flux_id:
-            query = query.filter(FluxRss.id == filters.flux_id)
+            conditions.append(Article.flux_id == filters.flux_id)
         
         if filters.search_query:
-            pattern = f"%{filters.search_query}%"
-            query = query.filter(
-                or_(
-                    Article.titre.ilike(pattern),
-                    Article.contenu.ilike(pattern),
-                    Article.resume.ilike(pattern)
+            # Recherche plein texte (index GIN sur article.search_vector)
+            conditions.append(
+                Article.search_vector.op('@@')(
+                    func.plainto_tsquery('french', filters.search_query)
                 )
             )
         
         if filters.date_debut:
-            query = query.filter(Article.publie_le >= filters.date_debut)
+            conditions.append(Article.publie_le >= filters.date_debut)
         
         if filters.date_fin:
-            query = query.filter(Article.publie_le <= filters.date_fin)
-        
-        # Joindre les statuts utilisateur
-        query = query.outerjoin(
-            StatutUtilisateurArticle,
-            and_(
-                StatutUtilisateurArticle.article_id == Article.id,
-                StatutUtilisateurArticle.utilisateur_id == user_id
-            )
-        )
+            conditions.append(Article.publie_le <= filters.date_fin)
         
         # Filtrer par statut
+        status_conditions = []
         if filters.only_unread:
-            query = query.filter(
+            status_conditions.append(
                 or_(
                     StatutUtilisateurArticle.est_lu == False,
                     StatutUtilisateurArticle.est_lu.is_(None)
@@ -406,42 +353,77 @@ class RssBusiness:
             )
         
         if filters.only_favorites:
-            query = query.filter(StatutUtilisateurArticle.est_favori == True)
+            status_conditions.append(StatutUtilisateurArticle.est_favori == True)
         
-        # Compter avant pagination
-        total = query.count()
+        statut_join = and_(
+            StatutUtilisateurArticle.article_id == Article.id,
+            StatutUtilisateurArticle.utilisateur_id == user_id
+        )
         
-        # Tri
-        if sort_by == "date":
-            if sort_order == "asc":
-                query = query.order_by(Article.publie_le.asc())
-            else:
-                query = query.order_by(Article.publie_le.desc())
-        elif sort_by == "title":
+        # Requête de base (flux et statut joints pour l'affichage)
+        query = self.db.query(Article).join(
+            FluxRss, Article.flux_id == FluxRss.id
+        ).join(
+            FluxCategorie, FluxRss.id == FluxCategorie.flux_id
+        ).join(
+            Categorie, FluxCategorie.categorie_id == Categorie.id
+        ).outerjoin(
+            StatutUtilisateurArticle, statut_join
+        ).filter(*conditions, *status_conditions)
+        
+        use_cursor = (
+            filters.before_date is not None
+            and filters.before_id is not None
+            and sort_by in (None, "date")
+            and sort_order == "desc"
+        )
+        
+        if use_cursor:
+            # Pagination par curseur : pas de COUNT ni d'OFFSET
+            total = None
+            query = query.filter(
+                tuple_(Article.publie_le, Article.id) < (filters.before_date, filters.before_id)
+            )
+        else:
+            # Compter avec les seules jointures qui filtrent : flux_rss n'est
+            # jamais nécessaire, le statut seulement si on filtre dessus
+            count_query = self.db.query(func.count(Article.id)).select_from(Article).join(
+                FluxCategorie, Article.flux_id == FluxCategorie.flux_id
+            ).join(
+                Categorie, FluxCategorie.categorie_id == Categorie.id
+            )
+            if status_conditions:
+                count_query = count_query.outerjoin(StatutUtilisateurArticle, statut_join)
+            total = count_query.filter(*conditions, *status_conditions).scalar() or 0
+        
+        # Tri (l'id départage les articles publiés au même instant)
+        if sort_by == "title":
             if sort_order == "asc":
-                query = query.order_by(Article.titre.asc())
+                query = query.order_by(Article.titre.asc(), Article.id.asc())
             else:
-                query = query.order_by(Article.titre.desc())
+                query = query.order_by(Article.titre.desc(), Article.id.desc())
+        elif sort_by == "date" and sort_order == "asc":
+            query = query.order_by(Article.publie_le.asc(), Article.id.asc())
         else:
-            query = query.order_by(Article.publie_le.desc())
+            query = query.order_by(Article.publie_le.desc(), Article.id.desc())
+        
+        # Statut et nom du flux lus via les jointures déjà présentes
+        query = query.add_columns(
+            StatutUtilisateurArticle.est_lu,
+            StatutUtilisateurArticle.est_favori,
+            FluxRss.nom.label('flux_nom')
+        )
         
-        # Pagination
-        articles = query.offset(filters.offset).limit(filters.limit).all()
+        # Pagination (une ligne de plus pour savoir s'il reste des articles)
+        if not use_cursor:
+            query = query.offset(filters.offset)
+        rows = query.limit(filters.limit + 1).all()
+        has_more = len(rows) > filters.limit
+        rows = rows[:filters.limit]
         
         # Convertir en DTOs
         results = []
-        for article in articles:
-            # Récupérer le statut spécifiquement
-            statut = self.db.query(StatutUtilisateurArticle).filter(
-                StatutUtilisateurArticle.utilisateur_id == user_id,
-                StatutUtilisateurArticle.article_id == article.id
-            ).first()
-            
-            # Récupérer le nom du flux
-            flux_nom = self.db.query(FluxRss.nom).filter(
-                FluxRss.id == article.flux_id
-            ).scalar() or "Flux inconnu"
-            
+        for article, est_lu, est_favori, flux_nom in rows:
             results.append(ArticleResponseDTO(
                 id=article.id,
                 titre=article.titre,
@@ -452,23 +434,23 @@ class RssBusiness:
                 publie_le=article.publie_le,
                 flux_id=article.flux_id,
                 flux_nom=flux_nom,
-                est_lu=statut.est_lu if statut else False,
-                est_favori=statut.est_favori if statut else False
+                est_lu=est_lu or False,
+                est_favori=est_favori or False
             ))
         
-        return results, total
+        return results, total, has_more
     
     def get_article_by_id(self, article_id: int) -> Optional[ArticleResponseDTO]:
         """Récupère un article par son ID"""
-        article = self.db.query(Article).filter(Article.id == article_id).first()
+        # Nom du flux lu dans la même requête
+        row = self.db.query(Article, FluxRss.nom).outerjoin(
+            FluxRss, Article.flux_id == FluxRss.id
+        ).filter(Article.id == article_id).first()
         
-        if not article:
+        if not row:
             return None
         
-        # Récupérer le nom du flux
-        flux_nom = self.db.query(FluxRss.nom).filter(
-            FluxRss.id == article.flux_id
-        ).scalar() or "Flux inconnu"
+        article, flux_nom = row
         
         # Note: On ne récupère pas le statut ici car il dépend de l'utilisateur
         return ArticleResponseDTO(
@@ -480,111 +462,75 @@ class RssBusiness:
             contenu=article.contenu,
             publie_le=article.publie_le,
             flux_id=article.flux_id,
-            flux_nom=flux_nom,
+            flux_nom=flux_nom or "Flux inconnu",
             est_lu=False,
             est_favori=False
         )
     
     def user_can_read_article(self, user_id: int, article_id: int) -> bool:
         """Vérifie si un utilisateur peut lire un article"""
-        article = self.db.query(Article).join(
-            FluxRss, Article.flux_id == FluxRss.id
-        ).join(
-            FluxCategorie, FluxRss.id == FluxCategorie.flux_id
+        query = self.db.query(Article.id).join(
+            FluxCategorie, Article.flux_id == FluxCategorie.flux_id
         ).join(
             Categorie, FluxCategorie.categorie_id == Categorie.id
         ).filter(
             Article.id == article_id,
             Categorie.utilisateur_id == user_id
-        ).first()
+        )
         
-        return article is not None
+        return self.db.query(query.exists()).scalar()
     
-    def mark_article_as_read(self, user_id: int, article_id: int):
-        """Marque un article comme lu"""
-        statut = self.db.query(StatutUtilisateurArticle).filter(
-            StatutUtilisateurArticle.utilisateur_id == user_id,
-            StatutUtilisateurArticle.article_id == article_id
-        ).first()
+    def get_readable_article_ids(self, user_id: int, article_ids: List[int]) -> set:
+        """Retourne, parmi article_ids, ceux que l'utilisateur peut lire (une requête)"""
+        if not article_ids:
+            return set()
         
-        if not statut:
-            statut = StatutUtilisateurArticle(
-                utilisateur_id=user_id,
-                article_id=article_id,
-                est_lu=True,
-                lu_le=datetime.utcnow()
-            )
-            self.db.add(statut)
-        else:
-            statut.est_lu = True
-            statut.lu_le = datetime.utcnow()
+        rows = self.db.query(Article.id).join(
+            FluxCategorie, Article.flux_id == FluxCategorie.flux_id
+        ).join(
+            Categorie, FluxCategorie.categorie_id == Categorie.id
+        ).filter(
+            Article.id.in_(set(article_ids)),
+            Categorie.utilisateur_id == user_id
+        ).distinct().all()
         
-        self.db.commit()
+        return {article_id for (article_id,) in rows}
+    
+    def mark_article_as_read(self, user_id: int, article_id: int):
+        """Marque un article comme lu"""
+        self._upsert_article_statuts(user_id, [article_id], est_lu=True, lu_le=datetime.utcnow())
     
     def mark_article_as_unread(self, user_id: int, article_id: int):
         """Marque un article comme non lu"""
-        statut = self.db.query(StatutUtilisateurArticle).filter(
-            StatutUtilisateurArticle.utilisateur_id == user_id,
-            StatutUtilisateurArticle.article_id == article_id
-        ).first()
-        
-        if statut:
-            statut.est_lu = False
-            statut.lu_le = None
-            self.db.commit()
+        self._update_article_statuts(user_id, [article_id], est_lu=False, lu_le=None)
     
     def add_article_to_favorites(self, user_id: int, article_id: int):
         """Ajoute un article aux favoris"""
-        statut = self.db.query(StatutUtilisateurArticle).filter(
-            StatutUtilisateurArticle.utilisateur_id == user_id,
-            StatutUtilisateurArticle.article_id == article_id
-        ).first()
-        
-        if not statut:
-            statut = StatutUtilisateurArticle(
-                utilisateur_id=user_id,
-                article_id=article_id,
-                est_favori=True,
-                mis_en_favori_le=datetime.utcnow()
-            )
-            self.db.add(statut)
-        else:
-            statut.est_favori = True
-            statut.mis_en_favori_le = datetime.utcnow()
-        
-        self.db.commit()
+        self._upsert_article_statuts(
+            user_id, [article_id], est_favori=True, mis_en_favori_le=datetime.utcnow()
+        )
     
     def remove_article_from_favorites(self, user_id: int, article_id: int):
         """Retire un article des favoris"""
-        statut = self.db.query(StatutUtilisateurArticle).filter(
-            StatutUtilisateurArticle.utilisateur_id == user_id,
-            StatutUtilisateurArticle.article_id == article_id
-        ).first()
-        
-        if statut:
-            statut.est_favori = False
-            statut.mis_en_favori_le = None
-            self.db.commit()
+        self._update_article_statuts(user_id, [article_id], est_favori=False, mis_en_favori_le=None)
     
     def mark_articles_as_read(self, user_id: int, article_ids: List[int]):
-        """Marque plusieurs articles comme lus"""
-        for article_id in article_ids:
-            self.mark_article_as_read(user_id, article_id)
+        """Marque plusieurs articles comme lus (un seul UPSERT)"""
+        self._upsert_article_statuts(user_id, article_ids, est_lu=True, lu_le=datetime.utcnow())
     
     def mark_articles_as_unread(self, user_id: int, article_ids: List[int]):
-        """Marque plusieurs articles comme non lus"""
-        for article_id in article_ids:
-            self.mark_article_as_unread(user_id, article_id)
+        """Marque plusieurs articles comme non lus (un seul UPDATE)"""
+        self._update_article_statuts(user_id, article_ids, est_lu=False, lu_le=None)
     
     def add_articles_to_favorites(self, user_id: int, article_ids: List[int]):
-        """Ajoute plusieurs articles aux favoris"""
-        for article_id in article_ids:
-            self.add_article_to_favorites(user_id, article_id)
+        """Ajoute plusieurs articles aux favoris (un seul UPSERT)"""
+        self._upsert_article_statuts(
+            user_id, article_ids, est_favori=True, mis_en_favori_le=datetime.utcnow()
+        )
     
     def remove_articles_from_favorites(self, user_id: int, article_ids: List[int]):
-        """Retire plusieurs articles des favoris"""
-        for article_id in article_ids:
-            self.remove_article_from_favorites(user_id, article_id)
+        """Retire plusieurs articles des favoris (un seul UPDATE)"""
+        self._update_article_statuts(user_id, article_ids, est_favori=False, mis_en_favori_le=None)
     
     def get_user_favorites(
         self,
@@ -593,8 +539,11 @@ class RssBusiness:
         offset: int = 0
     ) -> List[ArticleResponseDTO]:
         """Récupère les articles favoris de l'utilisateur"""
-        articles = self.db.query(Article).join(
+        # Nom du flux lu par jointure plutôt qu'une requête par article
+        rows = self.db.query(Article, FluxRss.nom).join(
             StatutUtilisateurArticle, Article.id == StatutUtilisateurArticle.article_id
+        ).outerjoin(
+            FluxRss, Article.flux_id == FluxRss.id
         ).filter(
             StatutUtilisateurArticle.utilisateur_id == user_id,
             StatutUtilisateurArticle.est_favori == True
@@ -603,12 +552,7 @@ class RssBusiness:
         ).offset(offset).limit(limit).all()
         
         results = []
-        for article in articles:
-            # Récupérer le nom du flux
-            flux_nom = self.db.query(FluxRss.nom).filter(
-                FluxRss.id == article.flux_id
-            ).scalar() or "Flux inconnu"
-            
+        for article, flux_nom in rows:
             results.append(ArticleResponseDTO(
                 id=article.id,
                 titre=article.titre,
@@ -618,7 +562,7 @@ class RssBusiness:
                 contenu=article.contenu,
                 publie_le=article.publie_le,
                 flux_id=article.flux_id,
-                flux_nom=flux_nom,
+                flux_nom=flux_nom or "Flux inconnu",
                 est_lu=True,  # Forcément lu si en favori
                 est_favori=True
             ))
@@ -632,73 +576,100 @@ class RssBusiness:
         flux_id: Optional[int] = None
     ) -> int:
         """Compte les articles non lus"""
-        query = self.db.query(Article).join(
-            FluxRss, Article.flux_id == FluxRss.id
-        ).join(
-            FluxCategorie, FluxRss.id == FluxCategorie.flux_id
-        ).join(
+        # Flux suivis par l'utilisateur (sans dupliquer un article rattaché
+        # à plusieurs catégories)
+        user_flux = self.db.query(FluxCategorie.flux_id).join(
             Categorie, FluxCategorie.categorie_id == Categorie.id
         ).filter(
             Categorie.utilisateur_id == user_id
         )
         
         if categorie_id:
-            query = query.filter(Categorie.id == categorie_id)
+            user_flux = user_flux.filter(Categorie.id == categorie_id)
         
         if flux_id:
-            query = query.filter(FluxRss.id == flux_id)
-        
-        # Joindre les statuts
-        query = query.outerjoin(
-            StatutUtilisateurArticle,
-            and_(
-                StatutUtilisateurArticle.article_id == Article.id,
-                StatutUtilisateurArticle.utilisateur_id == user_id
-            )
-        ).filter(
-            or_(
-                StatutUtilisateurArticle.est_lu == False,
-                StatutUtilisateurArticle.est_lu.is_(None)
-            )
-        )
+            user_flux = user_flux.filter(FluxCategorie.flux_id == flux_id)
         
-        return query.count()
+        # Anti-jointure sur les articles déjà lus
+        already_read = self.db.query(StatutUtilisateurArticle.id).filter(
+            StatutUtilisateurArticle.article_id == Article.id,
+            StatutUtilisateurArticle.utilisateur_id == user_id,
+            StatutUtilisateurArticle.est_lu == True
+        ).exists()
+        
+        return self.db.query(func.count(Article.id)).filter(
+            Article.flux_id.in_(user_flux),
+            ~already_read
+        ).scalar() or 0
     
     def import_opml(self, user_id: int, opml_content: bytes) -> int:
         """Importe des flux depuis un fichier OPML"""
         try:
-            root = ET.fromstring(opml_content)
+            # Obtenir la catégorie par défaut
+            categorie_id = self._get_default_categorie_id(user_id)
+            
+            # Parser les outlines en flux (une URL n'est retenue qu'une fois)
+            outlines: Dict[str, str] = {}
+            for _, outline in etree.iterparse(
+                io.BytesIO(opml_content), tag='outline', resolve_entities=False
+            ):
+                xml_url = outline.get('xmlUrl')
+                if xml_url and xml_url not in outlines:
+                    outlines[xml_url] = outline.get('text', '')
+                outline.clear()
+            
+            urls = list(outlines)
             imported_count = 0
             
-            # Obtenir la catégorie par défaut
-            categorie = self.db.query(Categorie).filter(
-                Categorie.utilisateur_id == user_id,
-                Categorie.nom == "Général"
-            ).first()
+            if urls:
+                # Flux déjà suivis par l'utilisateur : ignorés
+                already_followed = {
+                    url for (url,) in self.db.query(FluxRss.url).join(
+                        FluxCategorie
+                    ).join(
+                        Categorie
+                    ).filter(
+                        Categorie.utilisateur_id == user_id,
+                        FluxRss.url.in_(urls)
+                    ).all()
+                }
+                urls = [url for url in urls if url not in already_followed]
             
-            if not categorie:
-                categorie = Categorie(
-                    nom="Général",
-                    utilisateur_id=user_id,
-                    couleur="#007bff",
-                    cree_le=datetime.utcnow()
+            if urls:
+                # Flux existant déjà globalement
+                flux_ids = {
+                    url: flux_id for url, flux_id in self.db.query(
+                        FluxRss.url, FluxRss.id
+                    ).filter(FluxRss.url.in_(urls)).all()
+                }
+                
+                # Création des flux manquants en une seule requête ; les
+                # informations du flux sont complétées à la première récupération
+                now = datetime.utcnow()
+                new_rows = [
+                    {
+                        'nom': (outlines[url] or DEFAULT_FLUX_NOM)[:255],
+                        'url': url,
+                        'est_actif': True,
+                        'cree_le': now,
+                        'modifie_le': now
+                    }
+                    for url in urls if url not in flux_ids
+                ]
+                if new_rows:
+                    inserted = self.db.execute(
+                        pg_insert(FluxRss).values(new_rows).returning(FluxRss.url, FluxRss.id)
+                    ).all()
+                    flux_ids.update({url: flux_id for url, flux_id in inserted})
+                
+                # Association à la catégorie en une seule requête
+                self.db.execute(
+                    pg_insert(FluxCategorie).values([
+                        {'flux_id': flux_ids[url], 'categorie_id': categorie_id}
+                        for url in urls
+                    ]).on_conflict_do_nothing(constraint='unique_flux_categorie')
                 )
-                self.db.add(categorie)
-                self.db.flush()
-            
-            # Parser les outlines
-            for outline in root.iter('outline'):
-                xml_url = outline.get('xmlUrl')
-                if xml_url:
-                    # Vérifier si le flux n'existe pas déjà pour cet utilisateur
-                    if not self.flux_exists_for_user(user_id, xml_url):
-                        flux_data = FluxCreateDTO(
-                            url=xml_url,
-                            nom_personnalise=outline.get('text', ''),
-                            categorie_id=categorie.id
-                        )
-                        self.create_flux(user_id, flux_data)
-                        imported_count += 1
+                imported_count = len(urls)
             
             # Enregistrer l'import
             journal = JournalImport(
@@ -710,11 +681,14 @@ class RssBusiness:
             )
             self.db.add(journal)
             self.db.commit()
+            invalidate_user_search_cache(user_id)
             
             return imported_count
             
         except Exception as e:
             self.db.rollback()
+            # Une catégorie créée dans la transaction annulée n'existe plus
+            self._default_categorie_ids.clear()
             logger.error(f"Erreur lors de l'import OPML: {e}")
             raise
     
@@ -727,40 +701,57 @@ class RssBusiness:
         ).filter(
             Categorie.utilisateur_id == user_id,
             FluxRss.est_actif == True
-        ).all()
-        
-        for flux in flux_list:
-            try:
-                self.fetch_flux_articles(flux.id)
-            except Exception as e:
-                logger.error(f"Erreur lors de la récupération du flux {flux.id}: {e}")
+        ).distinct().all()
+        
+        # Téléchargements en parallèle (réseau) ; chaque flux est enregistré
+        # dès que son téléchargement se termine, sur la session du thread appelant
+        with ThreadPoolExecutor(max_workers=settings.RSS_FETCH_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    self._download_and_parse, flux.url, flux.etag, flux.last_modified
+                ): flux
+                for flux in flux_list
+            }
+            
+            for future in as_completed(futures):
+                flux = futures[future]
+                try:
+                    self._persist_entries(flux, future.result())
+                except Exception as e:
+                    self.db.rollback()
+                    logger.error(f"Erreur lors de la récupération du flux {flux.id}: {e}")
+                    self._record_failed_fetch(flux.id)
     
     def export_to_opml(self, user_id: int) -> str:
         """Exporte les flux de l'utilisateur au format OPML"""
-        flux_list = self.db.query(FluxRss).join(
+        flux_rows = self.db.query(FluxRss.nom, FluxRss.url).join(
             FluxCategorie
         ).join(
             Categorie
         ).filter(
             Categorie.utilisateur_id == user_id
-        ).all()
-        
-        # Créer le document OPML
-        opml = ET.Element('opml', version='2.0')
-        head = ET.SubElement(opml, 'head')
-        ET.SubElement(head, 'title').text = 'SUPRSS Export'
-        ET.SubElement(head, 'dateCreated').text = datetime.utcnow().isoformat()
-        
-        body = ET.SubElement(opml, 'body')
-        
-        for flux in flux_list:
-            ET.SubElement(body, 'outline',
-                text=flux.nom,
-                title=flux.nom,
-                type='rss',
-                xmlUrl=flux.url,
-                htmlUrl=flux.url
-            )
+        ).distinct().yield_per(500)
+        
+        # Écrire le document OPML au fil de l'eau (lignes lues par lots
+        # depuis un curseur serveur)
+        buffer = io.BytesIO()
+        with etree.xmlfile(buffer, encoding='utf-8') as xf:
+            with xf.element('opml', version='2.0'):
+                with xf.element('head'):
+                    with xf.element('title'):
+                        xf.write('SUPRSS Export')
+                    with xf.element('dateCreated'):
+                        xf.write(datetime.utcnow().isoformat())
+                
+                with xf.element('body'):
+                    for nom, url in flux_rows:
+                        xf.write(etree.Element('outline',
+                            text=nom,
+                            title=nom,
+                            type='rss',
+                            xmlUrl=url,
+                            htmlUrl=url
+                        ))
         
         # Enregistrer l'export
         journal = JournalExport(
@@ -772,17 +763,227 @@ class RssBusiness:
         self.db.add(journal)
         self.db.commit()
         
-        return ET.tostring(opml, encoding='unicode')
+        return buffer.getvalue().decode('utf-8')
     
     # Méthodes privées
-    def _parse_feed_info(self, url: str) -> Dict[str, str]:
-        """Parse les informations basiques d'un flux"""
-        try:
-            feed = feedparser.parse(url)
-            return {
-                'title': feed.feed.get('title', 'Sans titre'),
-                'description': feed.feed.get('description', '')
+    def _download_and_parse(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        modified: Optional[str] = None
+    ):
+        """
+        Télécharge et parse un flux (réseau uniquement, sans accès à la base).
+        etag/modified sont renvoyés au serveur : un flux inchangé répond 304
+        sans contenu. Le corps est lu par morceaux et borné à RSS_MAX_FEED_BYTES.
+        """
+        headers = {'User-Agent': settings.RSS_USER_AGENT}
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+        
+        with httpx.stream(
+            'GET',
+            url,
+            headers=headers,
+            timeout=settings.RSS_TIMEOUT,
+            follow_redirects=True
+        ) as response:
+            if response.status_code == 304:
+                return feedparser.FeedParserDict(status=304)
+            response.raise_for_status()
+            
+            body = bytearray()
+            for chunk in response.iter_bytes():
+                body += chunk
+                if len(body) > settings.RSS_MAX_FEED_BYTES:
+                    raise ValueError(f"Flux trop volumineux (> {settings.RSS_MAX_FEED_BYTES} octets)")
+        
+        feed = feedparser.parse(bytes(body), response_headers=dict(response.headers))
+        feed['status'] = response.status_code
+        feed['etag'] = response.headers.get('etag')
+        feed['modified'] = response.headers.get('last-modified')
+        return feed
+    
+    def _persist_entries(self, flux: FluxRss, feed) -> int:
+        """Enregistre les nouvelles entrées d'un flux déjà parsé"""
+        flux_id = flux.id
+        now = datetime.utcnow()
+        
+        # Flux inchangé depuis la dernière récupération (HTTP 304)
+        if feed.get('status') == 304:
+            flux.derniere_maj = now
+            self.db.commit()
+            logger.info(f"Flux {flux_id} inchangé")
+            return 0
+        
+        # Générer un GUID unique par entrée (les flux listent les entrées les
+        # plus récentes en premier : au-delà de la limite, elles sont anciennes)
+        entries = []
+        for entry in feed.entries[:settings.RSS_MAX_ENTRIES_PER_FEED]:
+            guid = entry.get('id', entry.get('link', ''))
+            if not guid:
+                # Empreinte de dédoublonnage (non cryptographique)
+                guid = hashlib.blake2b(
+                    entry.get('title', '').encode() + b'\x1f' + entry.get('published', '').encode(),
+                    digest_size=16
+                ).hexdigest()
+            
+            entries.append((guid[:500], entry))
+        
+        # Vérifier en une seule requête quels articles existent déjà
+        seen_guids = set()
+        if entries:
+            seen_guids = {
+                guid for (guid,) in self.db.query(Article.guid).filter(
+                    Article.flux_id == flux_id,
+                    Article.guid.in_([guid for guid, _ in entries])
+                ).all()
             }
+        
+        new_rows = []
+        for guid, entry in entries:
+            if guid in seen_guids:
+                continue
+            seen_guids.add(guid)
+            
+            # Date déjà analysée par feedparser (struct_time en UTC)
+            date_parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+            publie_le = datetime(*date_parsed[:6]) if date_parsed else now
+            
+            # Extraire le contenu
+            content = entry.get('content')
+            contenu = content[0].get('value', '') if content else None
+            auteur = entry.get('author')
+            
+            new_rows.append({
+                'flux_id': flux_id,
+                'titre': entry.get('title', 'Sans titre')[:500],
+                'lien': entry.get('link', ''),
+                'guid': guid,
+                'auteur': auteur[:255] if auteur else None,
+                'contenu': contenu,
+                'resume': entry.get('summary', ''),
+                'publie_le': publie_le,
+                'recupere_le': now,
+                'modifie_le': now
+            })
+        
+        # Une mise à jour concurrente du même flux peut avoir inséré
+        # les mêmes GUID entre-temps : l'index unique tranche
+        new_articles = 0
+        if new_rows:
+            new_articles = len(self.db.execute(
+                pg_insert(Article).values(new_rows).on_conflict_do_nothing(
+                    constraint='unique_guid_par_flux'
+                ).returning(Article.id)
+            ).all())
+        
+        # Compléter les flux créés sans analyse (création, import OPML)
+        if flux.nom == DEFAULT_FLUX_NOM and feed.feed.get('title'):
+            flux.nom = feed.feed.get('title')[:255]
+        if not flux.description:
+            flux.description = feed.feed.get('description', '')
+        
+        # Validateurs HTTP pour la prochaine requête conditionnelle
+        flux.etag = feed.get('etag')
+        flux.last_modified = feed.get('modified')
+        
+        # Mettre à jour la date de dernière MAJ
+        flux.derniere_maj = now
+        flux.modifie_le = now
+        self.db.commit()
+        
+        if new_articles:
+            invalidate_search_cache()
+        
+        logger.info(f"Ajouté {new_articles} articles pour le flux {flux_id}")
+        return new_articles
+    
+    def _record_failed_fetch(self, flux_id: int):
+        """
+        Date la tentative échouée : le flux n'est de nouveau échu qu'après
+        sa fréquence de mise à jour, et non à chaque passage du beat
+        """
+        try:
+            self.db.query(FluxRss).filter(FluxRss.id == flux_id).update(
+                {FluxRss.derniere_maj: datetime.utcnow()},
+                synchronize_session=False
+            )
+            self.db.commit()
         except Exception as e:
-            logger.error(f"Erreur lors du parsing du flux {url}: {e}")
-            return {'title': 'Flux RSS', 'description': ''}
\ No newline at end of file
+            self.db.rollback()
+            logger.error(f"Impossible d'enregistrer l'échec du flux {flux_id}: {e}")
+    
+    def _upsert_article_statuts(self, user_id: int, article_ids: List[int], **values):
+        """Crée ou met à jour les statuts de plusieurs articles en une requête INSERT ... ON CONFLICT"""
+        article_ids = list(dict.fromkeys(article_ids))
+        if not article_ids:
+            return
+        
+        try:
+            stmt = pg_insert(StatutUtilisateurArticle).values([
+                {'utilisateur_id': user_id, 'article_id': article_id, **values}
+                for article_id in article_ids
+            ])
+            stmt = stmt.on_conflict_do_update(
+                constraint='unique_statut_utilisateur_article',
+                set_={key: stmt.excluded[key] for key in values}
+            )
+            self.db.execute(stmt)
+            self.db.commit()
+            invalidate_user_search_cache(user_id)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Erreur lors de la mise à jour des statuts d'articles: {e}")
+            raise
+    
+    def _update_article_statuts(self, user_id: int, article_ids: List[int], **values):
+        """Met à jour les statuts existants de plusieurs articles en une requête UPDATE"""
+        if not article_ids:
+            return
+        
+        try:
+            self.db.query(StatutUtilisateurArticle).filter(
+                StatutUtilisateurArticle.utilisateur_id == user_id,
+                StatutUtilisateurArticle.article_id.in_(article_ids)
+            ).update(values, synchronize_session=False)
+            self.db.commit()
+            invalidate_user_search_cache(user_id)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Erreur lors de la mise à jour des statuts d'articles: {e}")
+            raise
+    
+    def _get_default_categorie_id(self, user_id: int) -> int:
+        """Retourne l'id de la catégorie "Général" de l'utilisateur, créée au besoin"""
+        categorie_id = self._default_categorie_ids.get(user_id)
+        if categorie_id is not None:
+            return categorie_id
+        
+        categorie_id = self.db.query(Categorie.id).filter(
+            Categorie.utilisateur_id == user_id,
+            Categorie.nom == "Général"
+        ).scalar()
+        
+        if categorie_id is None:
+            # Créer la catégorie par défaut si elle n'existe pas
+            categorie = Categorie(
+                nom="Général",
+                utilisateur_id=user_id,
+                couleur="#007bff",
+                cree_le=datetime.utcnow()
+            )
+            self.db.add(categorie)
+            self.db.flush()
+            categorie_id = categorie.id
+        
+        self._default_categorie_ids[user_id] = categorie_id
+        return categorie_id
+    
+    def _article_count_column(self):
+        """Sous-requête corrélée comptant les articles du flux courant (une seule requête SQL)"""
+        return self.db.query(func.count(Article.id)).filter(
+            Article.flux_id == FluxRss.id
+        ).correlate(FluxRss).scalar_subquery().label('nombre_articles')
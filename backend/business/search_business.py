@@ -1,6 +1,6 @@
 # business/search_business.py
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func, desc
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import or_, and_, case, exists, func, desc, select, tuple_, union_all
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
@@ -19,6 +19,8 @@ from models import (
     MembreCollection
 )
 from dtos.search_dto import SearchResultDTO
+from core.cache import cached_search
+from core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,7 @@ class SearchBusiness:
     def __init__(self, db: Session):
         self.db = db
     
+    @cached_search(ttl=settings.SEARCH_CACHE_TTL)
     def search_articles(
         self,
         user_id: int,
@@ -36,45 +39,46 @@ class SearchBusiness:
     ) -> List[SearchResultDTO]:
         """Recherche basique dans les articles de l'utilisateur"""
         try:
-            search_pattern = f"%{query}%"
-            
-            # Récupérer les flux de l'utilisateur via les catégories
-            user_flux_ids = self.db.query(FluxCategorie.flux_id).join(
-                Categorie
-            ).filter(
-                Categorie.utilisateur_id == user_id
-            ).subquery()
-            
-            articles = self.db.query(Article).filter(
-                Article.flux_id.in_(user_flux_ids),
-                or_(
-                    Article.titre.ilike(search_pattern),
-                    Article.contenu.ilike(search_pattern),
-                    Article.resume.ilike(search_pattern)
+            ts_query = self._text_query(query)
+            
+            # Statut de lecture lu par jointure externe dans la même requête
+            relevance = self._relevance_column(ts_query)
+            rows = self.db.query(
+                Article,
+                StatutUtilisateurArticle.est_lu,
+                StatutUtilisateurArticle.est_favori,
+                relevance,
+                self._headline_column(ts_query)
+            ).options(
+                self._article_result_columns()
+            ).outerjoin(
+                StatutUtilisateurArticle,
+                and_(
+                    StatutUtilisateurArticle.article_id == Article.id,
+                    StatutUtilisateurArticle.utilisateur_id == user_id
                 )
+            ).filter(
+                self._user_follows_flux(Article.flux_id, user_id),
+                Article.search_vector.op('@@')(ts_query)
+            ).order_by(
+                relevance.desc(), Article.publie_le.desc()
             ).limit(limit).all()
             
             results = []
-            for article in articles:
-                # Récupérer le statut de lecture
-                statut = self.db.query(StatutUtilisateurArticle).filter(
-                    StatutUtilisateurArticle.utilisateur_id == user_id,
-                    StatutUtilisateurArticle.article_id == article.id
-                ).first()
-                
+            for article, est_lu, est_favori, relevance_score, snippet in rows:
                 results.append(SearchResultDTO(
                     type="article",
                     id=article.id,
                     title=article.titre,
                     description=article.resume[:200] if article.resume else None,
                     url=article.lien,
-                    match_snippet=self._extract_snippet(article.contenu or article.resume, query),
-                    relevance_score=self._calculate_relevance(article, query),
+                    match_snippet=snippet,
+                    relevance_score=relevance_score,
                     metadata={
                         "flux_id": article.flux_id,
                         "publie_le": article.publie_le.isoformat() if article.publie_le else None,
-                        "est_lu": statut.est_lu if statut else False,
-                        "est_favori": statut.est_favori if statut else False,
+                        "est_lu": est_lu or False,
+                        "est_favori": est_favori or False,
                         "auteur": article.auteur
                     }
                 ))
@@ -85,6 +89,7 @@ class SearchBusiness:
             logger.error(f"Erreur lors de la recherche d'articles: {e}")
             return []
     
+    @cached_search(ttl=settings.SEARCH_CACHE_TTL)
     def search_flux(
         self,
         user_id: int,
@@ -93,28 +98,23 @@ class SearchBusiness:
     ) -> List[SearchResultDTO]:
         """Recherche dans les flux RSS de l'utilisateur"""
         try:
-            search_pattern = f"%{query}%"
+            search_pattern = f"%{self._escape_like(query)}%"
             
-            flux_list = self.db.query(FluxRss).join(
-                FluxCategorie
-            ).join(
-                Categorie
+            relevance = self._relevance_flux_column(search_pattern)
+            rows = self.db.query(FluxRss, relevance).options(
+                self._flux_result_columns()
             ).filter(
-                Categorie.utilisateur_id == user_id,
+                self._user_follows_flux(FluxRss.id, user_id),
                 or_(
-                    FluxRss.nom.ilike(search_pattern),
-                    FluxRss.description.ilike(search_pattern),
-                    FluxRss.url.ilike(search_pattern)
+                    FluxRss.nom.ilike(search_pattern, escape='\\'),
+                    FluxRss.description.ilike(search_pattern, escape='\\'),
+                    FluxRss.url.ilike(search_pattern, escape='\\')
                 )
-            ).limit(limit).all()
+            ).order_by(relevance.desc()).limit(limit).all()
             
+            nombres_articles = self._count_by(Article.flux_id, [flux.id for flux, _ in rows])
             results = []
-            for flux in flux_list:
-                # Compter le nombre d'articles pour ce flux
-                nombre_articles = self.db.query(func.count(Article.id)).filter(
-                    Article.flux_id == flux.id
-                ).scalar() or 0
-                
+            for flux, relevance_score in rows:
                 results.append(SearchResultDTO(
                     type="flux",
                     id=flux.id,
@@ -122,11 +122,11 @@ class SearchBusiness:
                     description=flux.description[:200] if flux.description else None,
                     url=flux.url,
                     match_snippet=None,
-                    relevance_score=self._calculate_relevance_flux(flux, query),
+                    relevance_score=relevance_score,
                     metadata={
                         "est_actif": flux.est_actif,
                         "derniere_maj": flux.derniere_maj.isoformat() if flux.derniere_maj else None,
-                        "nombre_articles": nombre_articles,
+                        "nombre_articles": nombres_articles.get(flux.id, 0),
                         "frequence_maj_heures": flux.frequence_maj_heures
                     }
                 ))
@@ -137,6 +137,7 @@ class SearchBusiness:
             logger.error(f"Erreur lors de la recherche de flux: {e}")
             return []
     
+    @cached_search(ttl=settings.SEARCH_CACHE_TTL)
     def search_collections(
         self,
         user_id: int,
@@ -145,10 +146,12 @@ class SearchBusiness:
     ) -> List[SearchResultDTO]:
         """Recherche dans les collections accessibles à l'utilisateur"""
         try:
-            search_pattern = f"%{query}%"
+            search_pattern = f"%{self._escape_like(query)}%"
+            
+            relevance = self._relevance_collection_column(search_pattern)
             
             # Collections possédées par l'utilisateur ou auxquelles il participe
-            collections = self.db.query(Collection).filter(
+            rows = self.db.query(Collection, relevance).filter(
                 or_(
                     Collection.proprietaire_id == user_id,
                     and_(
@@ -161,22 +164,16 @@ class SearchBusiness:
                     )
                 ),
                 or_(
-                    Collection.nom.ilike(search_pattern),
-                    Collection.description.ilike(search_pattern)
+                    Collection.nom.ilike(search_pattern, escape='\\'),
+                    Collection.description.ilike(search_pattern, escape='\\')
                 )
-            ).limit(limit).all()
+            ).order_by(relevance.desc()).limit(limit).all()
             
+            collection_ids = [collection.id for collection, _ in rows]
+            nombres_flux = self._count_by(CollectionFlux.collection_id, collection_ids)
+            nombres_membres = self._count_by(MembreCollection.collection_id, collection_ids)
             results = []
-            for collection in collections:
-                # Compter les flux et membres
-                nombre_flux = self.db.query(func.count(CollectionFlux.id)).filter(
-                    CollectionFlux.collection_id == collection.id
-                ).scalar() or 0
-                
-                nombre_membres = self.db.query(func.count(MembreCollection.id)).filter(
-                    MembreCollection.collection_id == collection.id
-                ).scalar() or 0
-                
+            for collection, relevance_score in rows:
                 results.append(SearchResultDTO(
                     type="collection",
                     id=collection.id,
@@ -184,12 +181,12 @@ class SearchBusiness:
                     description=collection.description[:200] if collection.description else None,
                     url=None,
                     match_snippet=None,
-                    relevance_score=self._calculate_relevance_collection(collection, query),
+                    relevance_score=relevance_score,
                     metadata={
                         "est_partagee": collection.est_partagee,
                         "proprietaire_id": collection.proprietaire_id,
-                        "nombre_flux": nombre_flux,
-                        "nombre_membres": nombre_membres,
+                        "nombre_flux": nombres_flux.get(collection.id, 0),
+                        "nombre_membres": nombres_membres.get(collection.id, 0),
                         "cree_le": collection.cree_le.isoformat() if collection.cree_le else None
                     }
                 ))
@@ -200,6 +197,7 @@ class SearchBusiness:
             logger.error(f"Erreur lors de la recherche de collections: {e}")
             return []
     
+    @cached_search(ttl=settings.SEARCH_CACHE_TTL)
     def search_comments(
         self,
         user_id: int,
@@ -208,11 +206,20 @@ class SearchBusiness:
     ) -> List[SearchResultDTO]:
         """Recherche dans les commentaires accessibles à l'utilisateur"""
         try:
-            search_pattern = f"%{query}%"
-            
-            # Commentaires dans les collections accessibles
-            comments = self.db.query(CommentaireArticle).join(
-                Collection
+            search_pattern = f"%{self._escape_like(query)}%"
+            
+            # Commentaires dans les collections accessibles, avec le titre de
+            # l'article ; snippet et pertinence calculés par PostgreSQL
+            relevance = self._relevance_comment_column(search_pattern, self._text_query(query))
+            rows = self.db.query(
+                CommentaireArticle,
+                Article.titre,
+                self._comment_snippet_column(query),
+                relevance
+            ).join(
+                Collection, Collection.id == CommentaireArticle.collection_id
+            ).outerjoin(
+                Article, Article.id == CommentaireArticle.article_id
             ).filter(
                 or_(
                     Collection.proprietaire_id == user_id,
@@ -222,15 +229,15 @@ class SearchBusiness:
                         )
                     )
                 ),
-                CommentaireArticle.contenu.ilike(search_pattern)
+                CommentaireArticle.contenu.ilike(search_pattern, escape='\\')
+            ).order_by(
+                desc(relevance),
+                CommentaireArticle.cree_le.desc()
             ).limit(limit).all()
             
             results = []
-            for comment in comments:
-                # Récupérer le titre de l'article associé
-                article_titre = self.db.query(Article.titre).filter(
-                    Article.id == comment.article_id
-                ).scalar() or "Article inconnu"
+            for comment, article_titre, snippet, relevance_score in rows:
+                article_titre = article_titre or "Article inconnu"
                 
                 results.append(SearchResultDTO(
                     type="comment",
@@ -238,8 +245,8 @@ class SearchBusiness:
                     title=f"Commentaire sur {article_titre[:50]}",
                     description=comment.contenu[:200],
                     url=None,
-                    match_snippet=self._extract_snippet(comment.contenu, query),
-                    relevance_score=self._calculate_relevance_comment(comment, query),
+                    match_snippet=snippet,
+                    relevance_score=relevance_score,
                     metadata={
                         "article_id": comment.article_id,
                         "collection_id": comment.collection_id,
@@ -254,6 +261,7 @@ class SearchBusiness:
             logger.error(f"Erreur lors de la recherche de commentaires: {e}")
             return []
     
+    @cached_search(ttl=settings.SEARCH_CACHE_TTL)
     def search_articles_advanced(
         self,
         user_id: int,
@@ -265,25 +273,25 @@ class SearchBusiness:
         only_unread: bool = False,
         only_favorites: bool = False,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        before_date: Optional[datetime] = None,
+        before_id: Optional[int] = None
     ) -> List[SearchResultDTO]:
-        """Recherche avancée dans les articles avec filtres"""
+        """
+        Recherche avancée dans les articles avec filtres.
+        Si before_date et before_id (publie_le et id du dernier résultat reçu)
+        sont fournis, la pagination se fait par curseur et offset est ignoré.
+        """
         try:
-            search_pattern = f"%{query}%"
+            ts_query = self._text_query(query)
             
-            # Base query avec jointure pour accéder aux flux de l'utilisateur
-            query_obj = self.db.query(Article).join(
-                FluxCategorie, Article.flux_id == FluxCategorie.flux_id
-            ).join(
-                Categorie
+            # Articles des flux de l'utilisateur (éventuellement d'une catégorie)
+            query_obj = self.db.query(Article).options(
+                self._article_result_columns()
             ).filter(
-                Categorie.utilisateur_id == user_id
+                self._user_follows_flux(Article.flux_id, user_id, category_id)
             )
             
-            # Filtre par catégorie
-            if category_id:
-                query_obj = query_obj.filter(Categorie.id == category_id)
-            
             # Filtre par flux spécifique
             if flux_id:
                 query_obj = query_obj.filter(Article.flux_id == flux_id)
@@ -303,70 +311,70 @@ class SearchBusiness:
                 except ValueError:
                     logger.warning(f"Format de date invalide pour date_to: {date_to}")
             
+            # Statut et nom du flux lus par jointures externes (LEFT JOIN pour
+            # inclure les articles sans statut)
+            query_obj = query_obj.outerjoin(
+                StatutUtilisateurArticle,
+                and_(
+                    StatutUtilisateurArticle.article_id == Article.id,
+                    StatutUtilisateurArticle.utilisateur_id == user_id
+                )
+            ).outerjoin(
+                FluxRss, Article.flux_id == FluxRss.id
+            ).add_columns(
+                StatutUtilisateurArticle.est_lu,
+                StatutUtilisateurArticle.est_favori,
+                FluxRss.nom,
+                self._relevance_column(ts_query),
+                self._headline_column(ts_query)
+            )
+            
             # Filtre par statut (non-lu/favoris)
-            if only_unread or only_favorites:
-                # Utiliser LEFT JOIN pour inclure les articles sans statut
-                query_obj = query_obj.outerjoin(
-                    StatutUtilisateurArticle,
-                    and_(
-                        StatutUtilisateurArticle.article_id == Article.id,
-                        StatutUtilisateurArticle.utilisateur_id == user_id
+            if only_unread:
+                query_obj = query_obj.filter(
+                    or_(
+                        StatutUtilisateurArticle.est_lu == False,
+                        StatutUtilisateurArticle.est_lu.is_(None)
                     )
                 )
-                
-                if only_unread:
-                    query_obj = query_obj.filter(
-                        or_(
-                            StatutUtilisateurArticle.est_lu == False,
-                            StatutUtilisateurArticle.est_lu.is_(None)
-                        )
-                    )
-                if only_favorites:
-                    query_obj = query_obj.filter(
-                        StatutUtilisateurArticle.est_favori == True
-                    )
+            if only_favorites:
+                query_obj = query_obj.filter(
+                    StatutUtilisateurArticle.est_favori == True
+                )
             
-            # Recherche textuelle
-            query_obj = query_obj.filter(
-                or_(
-                    Article.titre.ilike(search_pattern),
-                    Article.contenu.ilike(search_pattern),
-                    Article.resume.ilike(search_pattern),
-                    Article.auteur.ilike(search_pattern)
+            # Recherche plein texte (index GIN sur article.search_vector)
+            query_obj = query_obj.filter(Article.search_vector.op('@@')(ts_query))
+            
+            # Tri par date de publication (id pour départager), avant toute
+            # pagination : Query refuse un order_by après offset/limit
+            query_obj = query_obj.order_by(desc(Article.publie_le), desc(Article.id))
+            
+            if before_date is not None and before_id is not None:
+                query_obj = query_obj.filter(
+                    tuple_(Article.publie_le, Article.id) < (before_date, before_id)
                 )
-            )
+            else:
+                query_obj = query_obj.offset(offset)
             
-            # Pagination avec tri par date de publication
-            articles = query_obj.order_by(desc(Article.publie_le)).offset(offset).limit(limit).all()
+            rows = query_obj.limit(limit).all()
             
             results = []
-            for article in articles:
-                # Récupérer le statut spécifiquement pour chaque article
-                statut = self.db.query(StatutUtilisateurArticle).filter(
-                    StatutUtilisateurArticle.utilisateur_id == user_id,
-                    StatutUtilisateurArticle.article_id == article.id
-                ).first()
-                
-                # Récupérer le nom du flux
-                flux_nom = self.db.query(FluxRss.nom).filter(
-                    FluxRss.id == article.flux_id
-                ).scalar() or "Flux inconnu"
-                
+            for article, est_lu, est_favori, flux_nom, relevance_score, snippet in rows:
                 results.append(SearchResultDTO(
                     type="article",
                     id=article.id,
                     title=article.titre,
                     description=article.resume[:200] if article.resume else None,
                     url=article.lien,
-                    match_snippet=self._extract_snippet(article.contenu or article.resume, query),
-                    relevance_score=self._calculate_relevance(article, query),
+                    match_snippet=snippet,
+                    relevance_score=relevance_score,
                     metadata={
                         "flux_id": article.flux_id,
-                        "flux_nom": flux_nom,
+                        "flux_nom": flux_nom or "Flux inconnu",
                         "auteur": article.auteur,
                         "publie_le": article.publie_le.isoformat() if article.publie_le else None,
-                        "est_lu": statut.est_lu if statut else False,
-                        "est_favori": statut.est_favori if statut else False
+                        "est_lu": est_lu or False,
+                        "est_favori": est_favori or False
                     }
                 ))
             
@@ -376,6 +384,7 @@ class SearchBusiness:
             logger.error(f"Erreur lors de la recherche avancée d'articles: {e}")
             return []
     
+    @cached_search(ttl=settings.SEARCH_CACHE_TTL)
     def search_flux_advanced(
         self,
         user_id: int,
@@ -386,36 +395,28 @@ class SearchBusiness:
     ) -> List[SearchResultDTO]:
         """Recherche avancée dans les flux"""
         try:
-            search_pattern = f"%{query}%"
+            search_pattern = f"%{self._escape_like(query)}%"
             
-            query_obj = self.db.query(FluxRss).join(
-                FluxCategorie
-            ).join(
-                Categorie
+            relevance = self._relevance_flux_column(search_pattern)
+            query_obj = self.db.query(FluxRss, relevance).options(
+                self._flux_result_columns()
             ).filter(
-                Categorie.utilisateur_id == user_id,
+                self._user_follows_flux(FluxRss.id, user_id, category_id),
                 or_(
-                    FluxRss.nom.ilike(search_pattern),
-                    FluxRss.description.ilike(search_pattern),
-                    FluxRss.url.ilike(search_pattern)
+                    FluxRss.nom.ilike(search_pattern, escape='\\'),
+                    FluxRss.description.ilike(search_pattern, escape='\\'),
+                    FluxRss.url.ilike(search_pattern, escape='\\')
                 )
             )
             
-            if category_id:
-                query_obj = query_obj.filter(Categorie.id == category_id)
-            
             if only_active:
                 query_obj = query_obj.filter(FluxRss.est_actif == True)
             
-            flux_list = query_obj.limit(limit).all()
+            rows = query_obj.order_by(relevance.desc()).limit(limit).all()
             
+            nombres_articles = self._count_by(Article.flux_id, [flux.id for flux, _ in rows])
             results = []
-            for flux in flux_list:
-                # Compter les articles pour ce flux
-                nombre_articles = self.db.query(func.count(Article.id)).filter(
-                    Article.flux_id == flux.id
-                ).scalar() or 0
-                
+            for flux, relevance_score in rows:
                 results.append(SearchResultDTO(
                     type="flux",
                     id=flux.id,
@@ -423,12 +424,12 @@ class SearchBusiness:
                     description=flux.description[:200] if flux.description else None,
                     url=flux.url,
                     match_snippet=None,
-                    relevance_score=self._calculate_relevance_flux(flux, query),
+                    relevance_score=relevance_score,
                     metadata={
                         "est_actif": flux.est_actif,
                         "frequence_maj_heures": flux.frequence_maj_heures,
                         "derniere_maj": flux.derniere_maj.isoformat() if flux.derniere_maj else None,
-                        "nombre_articles": nombre_articles
+                        "nombre_articles": nombres_articles.get(flux.id, 0)
                     }
                 ))
             
@@ -438,6 +439,7 @@ class SearchBusiness:
             logger.error(f"Erreur lors de la recherche avancée de flux: {e}")
             return []
     
+    @cached_search(ttl=settings.SEARCH_CACHE_TTL)
     def search_collections_advanced(
         self,
         user_id: int,
@@ -448,12 +450,13 @@ class SearchBusiness:
     ) -> List[SearchResultDTO]:
         """Recherche avancée dans les collections"""
         try:
-            search_pattern = f"%{query}%"
+            search_pattern = f"%{self._escape_like(query)}%"
             
-            query_obj = self.db.query(Collection).filter(
+            relevance = self._relevance_collection_column(search_pattern)
+            query_obj = self.db.query(Collection, relevance).filter(
                 or_(
-                    Collection.nom.ilike(search_pattern),
-                    Collection.description.ilike(search_pattern)
+                    Collection.nom.ilike(search_pattern, escape='\\'),
+                    Collection.description.ilike(search_pattern, escape='\\')
                 )
             )
             
@@ -474,23 +477,20 @@ class SearchBusiness:
                     )
                 query_obj = query_obj.filter(or_(*conditions))
             
-            collections = query_obj.limit(limit).all()
-            
+            rows = query_obj.order_by(relevance.desc()).limit(limit).all()
+            
+            collection_ids = [collection.id for collection, _ in rows]
+            nombres_flux = self._count_by(CollectionFlux.collection_id, collection_ids)
+            nombres_membres = self._count_by(MembreCollection.collection_id, collection_ids)
+            proprietaire_ids = {collection.proprietaire_id for collection, _ in rows}
+            proprietaire_noms = dict(
+                self.db.query(Utilisateur.id, Utilisateur.nom_utilisateur).filter(
+                    Utilisateur.id.in_(proprietaire_ids)
+                ).all()
+            ) if proprietaire_ids else {}
             results = []
-            for collection in collections:
-                # Compter flux et membres
-                nombre_flux = self.db.query(func.count(CollectionFlux.id)).filter(
-                    CollectionFlux.collection_id == collection.id
-                ).scalar() or 0
-                
-                nombre_membres = self.db.query(func.count(MembreCollection.id)).filter(
-                    MembreCollection.collection_id == collection.id
-                ).scalar() or 0
-                
-                # Récupérer le nom du propriétaire
-                proprietaire_nom = self.db.query(Utilisateur.nom_utilisateur).filter(
-                    Utilisateur.id == collection.proprietaire_id
-                ).scalar() or "Utilisateur inconnu"
+            for collection, relevance_score in rows:
+                proprietaire_nom = proprietaire_noms.get(collection.proprietaire_id) or "Utilisateur inconnu"
                 
                 results.append(SearchResultDTO(
                     type="collection",
@@ -499,13 +499,13 @@ class SearchBusiness:
                     description=collection.description[:200] if collection.description else None,
                     url=None,
                     match_snippet=None,
-                    relevance_score=self._calculate_relevance_collection(collection, query),
+                    relevance_score=relevance_score,
                     metadata={
                         "est_partagee": collection.est_partagee,
                         "proprietaire_id": collection.proprietaire_id,
                         "proprietaire_nom": proprietaire_nom,
-                        "nombre_flux": nombre_flux,
-                        "nombre_membres": nombre_membres,
+                        "nombre_flux": nombres_flux.get(collection.id, 0),
+                        "nombre_membres": nombres_membres.get(collection.id, 0),
                         "cree_le": collection.cree_le.isoformat() if collection.cree_le else None
                     }
                 ))
@@ -516,6 +516,7 @@ class SearchBusiness:
             logger.error(f"Erreur lors de la recherche avancée de collections: {e}")
             return []
     
+    @cached_search(ttl=settings.CACHE_TTL)
     def get_search_suggestions(
         self,
         user_id: int,
@@ -525,42 +526,32 @@ class SearchBusiness:
     ) -> List[str]:
         """Récupère des suggestions de recherche basées sur les données existantes"""
         try:
-            suggestions = set()
-            pattern = f"{query_prefix}%"
+            pattern = f"{self._escape_like(query_prefix)}%"
+            branches = []
             
             if search_type in ["all", "articles"]:
                 # Suggestions depuis les titres d'articles
-                article_titles = self.db.query(Article.titre).join(
-                    FluxCategorie, Article.flux_id == FluxCategorie.flux_id
-                ).join(
-                    Categorie
+                branches.append(self.db.query(
+                    func.substr(Article.titre, 1, 100).label('suggestion')
                 ).filter(
-                    Categorie.utilisateur_id == user_id,
-                    Article.titre.ilike(pattern)
-                ).limit(limit).all()
-                
-                for title, in article_titles:
-                    if title:
-                        suggestions.add(title[:100])
+                    self._user_follows_flux(Article.flux_id, user_id),
+                    Article.titre.ilike(pattern, escape='\\')
+                ).limit(limit).subquery())
             
             if search_type in ["all", "flux"]:
                 # Suggestions depuis les noms de flux
-                flux_names = self.db.query(FluxRss.nom).join(
-                    FluxCategorie
-                ).join(
-                    Categorie
+                branches.append(self.db.query(
+                    FluxRss.nom.label('suggestion')
                 ).filter(
-                    Categorie.utilisateur_id == user_id,
-                    FluxRss.nom.ilike(pattern)
-                ).limit(limit).all()
-                
-                for name, in flux_names:
-                    if name:
-                        suggestions.add(name)
+                    self._user_follows_flux(FluxRss.id, user_id),
+                    FluxRss.nom.ilike(pattern, escape='\\')
+                ).limit(limit).subquery())
             
             if search_type in ["all", "collections"]:
                 # Suggestions depuis les noms de collections
-                collection_names = self.db.query(Collection.nom).filter(
+                branches.append(self.db.query(
+                    Collection.nom.label('suggestion')
+                ).filter(
                     or_(
                         Collection.proprietaire_id == user_id,
                         Collection.id.in_(
@@ -569,14 +560,23 @@ class SearchBusiness:
                             )
                         )
                     ),
-                    Collection.nom.ilike(pattern)
-                ).limit(limit).all()
-                
-                for name, in collection_names:
-                    if name:
-                        suggestions.add(name)
+                    Collection.nom.ilike(pattern, escape='\\')
+                ).limit(limit).subquery())
             
-            return list(suggestions)[:limit]
+            if not branches:
+                return []
+            
+            # Une seule requête : UNION ALL des sources, dédoublonnage en SQL
+            suggestions = union_all(
+                *(select(branch.c.suggestion) for branch in branches)
+            ).subquery('suggestions')
+            
+            rows = self.db.query(suggestions.c.suggestion).filter(
+                suggestions.c.suggestion.isnot(None),
+                suggestions.c.suggestion != ''
+            ).distinct().limit(limit).all()
+            
+            return [suggestion for (suggestion,) in rows]
             
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des suggestions: {e}")
@@ -618,20 +618,12 @@ class SearchBusiness:
         """Statistiques basiques sans table d'historique"""
         try:
             # Calculer quelques statistiques basiques
-            total_articles = self.db.query(func.count(Article.id)).join(
-                FluxCategorie, Article.flux_id == FluxCategorie.flux_id
-            ).join(
-                Categorie
-            ).filter(
-                Categorie.utilisateur_id == user_id
+            total_articles = self.db.query(func.count(Article.id)).filter(
+                self._user_follows_flux(Article.flux_id, user_id)
             ).scalar() or 0
             
-            total_flux = self.db.query(func.count(FluxRss.id)).join(
-                FluxCategorie
-            ).join(
-                Categorie
-            ).filter(
-                Categorie.utilisateur_id == user_id
+            total_flux = self.db.query(func.count(FluxRss.id)).filter(
+                self._user_follows_flux(FluxRss.id, user_id)
             ).scalar() or 0
             
             return {
@@ -658,71 +650,100 @@ class SearchBusiness:
         logger.info(f"Rebuild index appelé pour l'utilisateur {user_id} - non nécessaire")
     
     # Méthodes utilitaires privées
-    def _extract_snippet(self, text: Optional[str], query: str, context_length: int = 150) -> Optional[str]:
-        """Extrait un snippet du texte autour du terme recherché"""
-        if not text:
-            return None
-        
-        text_lower = text.lower()
-        query_lower = query.lower()
-        
-        index = text_lower.find(query_lower)
-        if index == -1:
-            return text[:context_length] + "..." if len(text) > context_length else text
-        
-        start = max(0, index - context_length // 2)
-        end = min(len(text), index + len(query) + context_length // 2)
-        
-        snippet = text[start:end]
-        if start > 0:
-            snippet = "..." + snippet
-        if end < len(text):
-            snippet = snippet + "..."
-        
-        return snippet
+    def _escape_like(self, text: str) -> str:
+        """Échappe les métacaractères LIKE (\\, % et _) saisis par l'utilisateur"""
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    def _user_follows_flux(self, flux_id_column, user_id: int, category_id: Optional[int] = None):
+        """
+        Condition EXISTS : le flux flux_id_column est dans une catégorie de
+        l'utilisateur (sans jointure, donc sans doublon si le flux est classé
+        dans plusieurs catégories)
+        """
+        conditions = [
+            FluxCategorie.flux_id == flux_id_column,
+            Categorie.id == FluxCategorie.categorie_id,
+            Categorie.utilisateur_id == user_id
+        ]
+        if category_id:
+            conditions.append(Categorie.id == category_id)
+        return exists().where(and_(*conditions))
+    
+    def _count_by(self, column, ids: List[int]) -> Dict[int, int]:
+        """Compte les lignes par valeur de column (une seule requête GROUP BY)"""
+        if not ids:
+            return {}
+        return dict(
+            self.db.query(column, func.count()).filter(
+                column.in_(ids)
+            ).group_by(column).all()
+        )
+    
+    def _text_query(self, query: str):
+        """Requête plein texte (configuration française) pour article.search_vector"""
+        return func.plainto_tsquery('french', query)
+    
+    def _article_result_columns(self):
+        """Colonnes d'article lues pour un résultat de recherche (ni contenu ni search_vector)"""
+        return load_only(
+            Article.id, Article.flux_id, Article.titre, Article.resume,
+            Article.lien, Article.auteur, Article.publie_le
+        )
+    
+    def _flux_result_columns(self):
+        """Colonnes de flux lues pour un résultat de recherche"""
+        return load_only(
+            FluxRss.id, FluxRss.nom, FluxRss.description, FluxRss.url,
+            FluxRss.est_actif, FluxRss.derniere_maj, FluxRss.frequence_maj_heures
+        )
+    
+    def _relevance_column(self, ts_query):
+        """Score de pertinence d'un article (poids titre > auteur/résumé > contenu)"""
+        return func.ts_rank_cd(Article.search_vector, ts_query).label('relevance')
+    
+    def _headline_column(self, ts_query):
+        """Snippet calculé par PostgreSQL (le contenu complet ne quitte pas la base)"""
+        return func.ts_headline(
+            'french',
+            func.coalesce(func.nullif(Article.contenu, ''), Article.resume),
+            ts_query,
+            'MaxFragments=1, MaxWords=30, MinWords=10, StartSel="", StopSel=""'
+        ).label('snippet')
     
-    def _calculate_relevance(self, article: Article, query: str) -> float:
-        """Calcule la pertinence d'un article"""
-        score = 0.0
-        query_lower = query.lower()
-        
-        if article.titre and query_lower in article.titre.lower():
-            score += 3.0
-        if article.resume and query_lower in article.resume.lower():
-            score += 2.0
-        if article.contenu and query_lower in article.contenu.lower():
-            score += 1.0
-        if article.auteur and query_lower in article.auteur.lower():
-            score += 1.5
-        
-        return score
+    def _comment_snippet_column(self, query: str, context_length: int = 150):
+        """
+        Snippet d'un commentaire centré sur le terme trouvé par le filtre ILIKE
+        (sous-chaîne, donc aussi les mots partiels et les URL), calculé en SQL
+        """
+        half = context_length // 2
+        contenu = CommentaireArticle.contenu
+        position = func.strpos(func.lower(contenu), func.lower(query))
+        start = func.greatest(position - half, 1)
+        end = position + len(query) + half
+        return func.concat(
+            case((start > 1, '...'), else_=''),
+            func.substr(contenu, start, end - start),
+            case((end <= func.char_length(contenu), '...'), else_='')
+        ).label('snippet')
     
-    def _calculate_relevance_flux(self, flux: FluxRss, query: str) -> float:
-        """Calcule la pertinence d'un flux"""
-        score = 0.0
-        query_lower = query.lower()
-        
-        if flux.nom and query_lower in flux.nom.lower():
-            score += 3.0
-        if flux.description and query_lower in flux.description.lower():
-            score += 2.0
-        if flux.url and query_lower in flux.url.lower():
-            score += 1.0
-        
-        return score
+    def _relevance_flux_column(self, search_pattern: str):
+        """Score de pertinence d'un flux calculé en SQL (nom > description > url)"""
+        return (
+            case((FluxRss.nom.ilike(search_pattern, escape='\\'), 3.0), else_=0.0)
+            + case((FluxRss.description.ilike(search_pattern, escape='\\'), 2.0), else_=0.0)
+            + case((FluxRss.url.ilike(search_pattern, escape='\\'), 1.0), else_=0.0)
+        ).label('relevance')
     
-    def _calculate_relevance_collection(self, collection: Collection, query: str) -> float:
-        """Calcule la pertinence d'une collection"""
-        score = 0.0
-        query_lower = query.lower()
-        
-        if collection.nom and query_lower in collection.nom.lower():
-            score += 3.0
-        if collection.description and query_lower in collection.description.lower():
-            score += 2.0
-        
-        return score
+    def _relevance_comment_column(self, search_pattern: str, ts_query):
+        """Score de pertinence d'un commentaire calculé en SQL (mot entier > sous-chaîne)"""
+        return (
+            case((CommentaireArticle.contenu.ilike(search_pattern, escape='\\'), 2.0), else_=0.0)
+            + case((func.to_tsvector('french', CommentaireArticle.contenu).op('@@')(ts_query), 1.0), else_=0.0)
+        ).label('relevance')
     
-    def _calculate_relevance_comment(self, comment: CommentaireArticle, query: str) -> float:
-        """Calcule la pertinence d'un commentaire"""
-        return 2.0 if comment.contenu and query.lower() in comment.contenu.lower() else 0.0
\ No newline at end of file
+    def _relevance_collection_column(self, search_pattern: str):
+        """Score de pertinence d'une collection calculé en SQL (nom > description)"""
+        return (
+            case((Collection.nom.ilike(search_pattern, escape='\\'), 3.0), else_=0.0)
+            + case((Collection.description.ilike(search_pattern, escape='\\'), 2.0), else_=0.0)
+        ).label('relevance')
@@ -41,6 +41,7 @@ class UserBusiness:
             if not is_valid:
                 raise ValueError(error_msg)
             
+            now = datetime.utcnow()
             # Créer l'utilisateur
             user = Utilisateur(
                 nom_utilisateur=user_data.nom_utilisateur,
@@ -52,8 +53,8 @@ class UserBusiness:
                 email_verifie=False,
                 mode_sombre=False,
                 taille_police="medium",
-                cree_le=datetime.utcnow(),
-                modifie_le=datetime.utcnow()
+                cree_le=now,
+                modifie_le=now
             )
             
             self.db.add(user)
@@ -71,7 +72,7 @@ class UserBusiness:
                     nom="Général",
                     utilisateur_id=user.id,
                     couleur="#007bff",
-                    cree_le=datetime.utcnow()
+                    cree_le=now
                 )
                 self.db.add(default_category)
             
@@ -470,6 +471,7 @@ class UserBusiness:
     ) -> Utilisateur:
         """Récupère ou crée un utilisateur OAuth"""
         try:
+            now = datetime.utcnow()
             # Vérifier si l'utilisateur OAuth existe déjà
             oauth_user = self.db.query(UtilisateurOauth).filter(
                 UtilisateurOauth.provider == provider,
@@ -489,10 +491,10 @@ class UserBusiness:
                 # Mettre à jour les tokens OAuth
                 oauth_user.access_token = access_token
                 oauth_user.refresh_token = refresh_token
-                oauth_user.derniere_utilisation = datetime.utcnow()
+                oauth_user.derniere_utilisation = now
                 
-                user.derniere_connexion = datetime.utcnow()
-                user.modifie_le = datetime.utcnow()
+                user.derniere_connexion = now
+                user.modifie_le = now
                 
                 self.db.commit()
                 return user
@@ -510,13 +512,13 @@ class UserBusiness:
                     provider_username=nom_utilisateur,
                     access_token=access_token,
                     refresh_token=refresh_token,
-                    cree_le=datetime.utcnow(),
-                    derniere_utilisation=datetime.utcnow()
+                    cree_le=now,
+                    derniere_utilisation=now
                 )
                 
                 self.db.add(oauth_record)
-                user.derniere_connexion = datetime.utcnow()
-                user.modifie_le = datetime.utcnow()
+                user.derniere_connexion = now
+                user.modifie_le = now
                 
                 self.db.commit()
                 return user
@@ -542,9 +544,9 @@ class UserBusiness:
                 email_verifie=True,  # Email déjà vérifié par le provider OAuth
                 mode_sombre=False,
                 taille_police="medium",
-                cree_le=datetime.utcnow(),
-                modifie_le=datetime.utcnow(),
-                derniere_connexion=datetime.utcnow()
+                cree_le=now,
+                modifie_le=now,
+                derniere_connexion=now
             )
             
             self.db.add(user)
@@ -560,8 +562,8 @@ class UserBusiness:
                 provider_username=nom_utilisateur,
                 access_token=access_token,
                 refresh_token=refresh_token,
-                cree_le=datetime.utcnow(),
-                derniere_utilisation=datetime.utcnow()
+                cree_le=now,
+                derniere_utilisation=now
             )
             
             self.db.add(oauth_record)
@@ -576,7 +578,7 @@ class UserBusiness:
                     nom="Général",
                     utilisateur_id=user.id,
                     couleur="#007bff",
-                    cree_le=datetime.utcnow()
+                    cree_le=now
                 )
                 self.db.add(default_category)
             
@@ -0,0 +1,112 @@
+# core/cache.py
+import hashlib
+import json
+import logging
+from functools import wraps
+from typing import Any, Callable, Optional, get_type_hints
+
+import redis
+from pydantic import parse_obj_as
+from pydantic.json import pydantic_encoder
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Incrémentée à chaque ingestion d'articles : les clés des versions
+# précédentes ne sont plus lues et expirent d'elles-mêmes
+SEARCH_CACHE_VERSION_KEY = "suprss:search:version"
+
+# Version propre à un utilisateur, incrémentée quand ses données visibles
+# en recherche changent (statuts, flux suivis, collections, commentaires)
+SEARCH_CACHE_USER_VERSION_KEY = "suprss:search:version:{user_id}"
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis_client() -> redis.Redis:
+    """Client Redis partagé (pool de connexions créé à la première utilisation)"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5
+        )
+    return _redis_client
+
+
+def _cache_key(name: str, version: bytes, user_version: bytes, user_id: int, args: tuple, kwargs: dict) -> str:
+    """Clé de cache : méthode, versions, utilisateur et paramètres normalisés"""
+    params = json.dumps([args, kwargs], sort_keys=True, default=str)
+    digest = hashlib.sha256(params.encode()).hexdigest()
+    return f"suprss:search:v{version.decode()}.{user_version.decode()}:{user_id}:{name}:{digest}"
+
+
+def cached_search(ttl: int) -> Callable:
+    """
+    Met en cache dans Redis le résultat d'une méthode de recherche
+    appelée sous la forme method(self, user_id, ...).
+    Redis indisponible : la recherche est simplement exécutée sans cache.
+    """
+    def decorator(func: Callable) -> Callable:
+        return_type = get_type_hints(func)["return"]
+
+        @wraps(func)
+        def wrapper(self, user_id: int, *args: Any, **kwargs: Any):
+            if not settings.CACHE_ENABLED:
+                return func(self, user_id, *args, **kwargs)
+
+            client = get_redis_client()
+            try:
+                version, user_version = client.mget(
+                    SEARCH_CACHE_VERSION_KEY,
+                    SEARCH_CACHE_USER_VERSION_KEY.format(user_id=user_id)
+                )
+                key = _cache_key(
+                    func.__name__, version or b"0", user_version or b"0",
+                    user_id, args, kwargs
+                )
+                cached = client.get(key)
+                if cached is not None:
+                    return parse_obj_as(return_type, json.loads(cached))
+            except redis.RedisError as e:
+                logger.warning(f"Cache de recherche indisponible: {e}")
+                return func(self, user_id, *args, **kwargs)
+
+            result = func(self, user_id, *args, **kwargs)
+
+            # Les méthodes de recherche renvoient [] en cas d'erreur : ne pas le figer
+            if result:
+                try:
+                    client.setex(key, ttl, json.dumps(result, default=pydantic_encoder))
+                except redis.RedisError as e:
+                    logger.warning(f"Écriture du cache de recherche impossible: {e}")
+
+            return result
+
+        return wrapper
+    return decorator
+
+
+def invalidate_search_cache():
+    """Invalide toutes les recherches en cache (nouveaux articles)"""
+    if not settings.CACHE_ENABLED:
+        return
+    try:
+        get_redis_client().incr(SEARCH_CACHE_VERSION_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Invalidation du cache de recherche impossible: {e}")
+
+
+def invalidate_user_search_cache(*user_ids: int):
+    """Invalide les recherches en cache des utilisateurs donnés"""
+    if not settings.CACHE_ENABLED or not user_ids:
+        return
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        for user_id in set(user_ids):
+            pipe.incr(SEARCH_CACHE_USER_VERSION_KEY.format(user_id=user_id))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Invalidation du cache de recherche impossible: {e}")
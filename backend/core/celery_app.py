@@ -7,6 +7,8 @@ logger = logging.getLogger(__name__)
 
 # Configuration Celery
 REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+# Période de vérification des flux échus (chaque flux garde sa propre fréquence)
+RSS_UPDATE_TICK_SECONDS = float(os.getenv('RSS_UPDATE_TICK_SECONDS', '300'))
 
 # Créer l'instance Celery
 celery_app = Celery(
@@ -35,7 +37,7 @@ celery_app.conf.update(
 celery_app.conf.beat_schedule = {
     'update-rss-feeds': {
         'task': 'core.tasks.update_all_rss_feeds',
-        'schedule': 3600.0,  # Toutes les heures
+        'schedule': RSS_UPDATE_TICK_SECONDS,
     },
     'cleanup-old-articles': {
         'task': 'core.tasks.cleanup_old_articles',
@@ -112,9 +112,11 @@ class Settings(BaseSettings):
     RSS_USER_AGENT: str = "SUPRSS/1.0 (+https://github.com/desireiai/suprss)"
     RSS_TIMEOUT: int = 30  # Secondes
     RSS_MAX_ENTRIES_PER_FEED: int = 100
+    RSS_MAX_FEED_BYTES: int = 10 * 1024 * 1024  # Taille maximale d'un flux téléchargé
     RSS_DEFAULT_UPDATE_FREQUENCY_HOURS: int = 6
     RSS_MIN_UPDATE_FREQUENCY_HOURS: int = 1
     RSS_MAX_UPDATE_FREQUENCY_HOURS: int = 168  # 1 semaine
+    RSS_FETCH_MAX_WORKERS: int = 8  # Téléchargements de flux en parallèle
     
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
@@ -127,6 +129,7 @@ class Settings(BaseSettings):
     # Cache
     CACHE_TTL: int = 300  # 5 minutes
     CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL: int = 60  # Résultats de recherche (secondes)
     
     # Search
     SEARCH_MIN_LENGTH: int = 2
@@ -19,7 +19,14 @@ engine = create_engine(
     pool_pre_ping=True,
     pool_recycle=3600,  # Recycler les connexions après 1 heure
     echo=settings.DEBUG,  # Log SQL queries en mode debug
-    future=True
+    future=True,
+    # executemany psycopg2 : INSERT multi-VALUES par pages, autres requêtes par lots
+    executemany_mode='values_plus_batch',
+    executemany_values_page_size=1000,
+    executemany_batch_page_size=500,
+    # Cache du SQL compilé : variantes de filtres de recherche et INSERT
+    # multi-VALUES (une entrée par nombre de lignes) tiennent sans éviction
+    query_cache_size=1200
 )
 
 # Configuration de la session
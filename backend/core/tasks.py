@@ -1,8 +1,12 @@
 # core/tasks.py
-from celery import shared_task
+from celery import group, shared_task
 import logging
 from datetime import datetime, timedelta
 
+# Enregistre l'application Celery configurée (broker Redis) pour les appels
+# .delay() faits depuis l'API
+from core.celery_app import celery_app  # noqa: F401
+
 logger = logging.getLogger(__name__)
 
 @shared_task
@@ -19,18 +23,20 @@ def update_all_rss_feeds():
         
         # Import ici pour éviter les imports circulaires
         from core.database import SessionLocal
+        from business.rss_business import RssBusiness
         
-        # TODO: Implémenter la logique de mise à jour des flux
-        # from business_models.rss_business import RSSBusiness
-        # db = SessionLocal()
-        # rss_business = RSSBusiness(db)
-        # feeds = rss_business.get_feeds_to_update()
-        # for feed in feeds:
-        #     update_single_feed.delay(feed.id)
-        # db.close()
+        db = SessionLocal()
+        try:
+            flux_ids = RssBusiness(db).get_flux_ids_to_update()
+        finally:
+            db.close()
         
-        logger.info("Mise à jour des flux RSS programmée")
-        return {"status": "success", "message": "RSS feeds update scheduled"}
+        # Publication groupée : une seule connexion au broker pour tous les flux
+        if flux_ids:
+            group(update_single_feed.s(flux_id) for flux_id in flux_ids).apply_async()
+        
+        logger.info(f"Mise à jour de {len(flux_ids)} flux RSS programmée")
+        return {"status": "success", "message": "RSS feeds update scheduled", "scheduled": len(flux_ids)}
         
     except Exception as e:
         logger.error(f"Erreur lors de la mise à jour des flux RSS: {e}")
@@ -42,21 +48,43 @@ def update_single_feed(feed_id: int):
     try:
         logger.info(f"Mise à jour du flux {feed_id}")
         
-        # TODO: Implémenter la logique
-        # from core.database import SessionLocal
-        # from business_models.rss_business import RSSBusiness
-        # db = SessionLocal()
-        # rss_business = RSSBusiness(db)
-        # result = rss_business.fetch_flux_articles(feed_id)
-        # db.close()
+        from core.database import SessionLocal
+        from business.rss_business import RssBusiness
+        
+        db = SessionLocal()
+        try:
+            new_articles = RssBusiness(db).fetch_flux_articles(feed_id)
+        finally:
+            db.close()
         
         logger.info(f"Flux {feed_id} mis à jour avec succès")
-        return {"status": "success", "feed_id": feed_id}
+        return {"status": "success", "feed_id": feed_id, "new_articles": new_articles}
         
     except Exception as e:
         logger.error(f"Erreur lors de la mise à jour du flux {feed_id}: {e}")
         return {"status": "error", "feed_id": feed_id, "message": str(e)}
 
+@shared_task
+def update_user_feeds(user_id: int):
+    """Met à jour tous les flux d'un utilisateur (après un import OPML)"""
+    try:
+        logger.info(f"Mise à jour des flux de l'utilisateur {user_id}")
+        
+        from core.database import SessionLocal
+        from business.rss_business import RssBusiness
+        
+        db = SessionLocal()
+        try:
+            RssBusiness(db).fetch_all_user_flux_articles(user_id)
+        finally:
+            db.close()
+        
+        return {"status": "success", "user_id": user_id}
+        
+    except Exception as e:
+        logger.error(f"Erreur lors de la mise à jour des flux de l'utilisateur {user_id}: {e}")
+        return {"status": "error", "user_id": user_id, "message": str(e)}
+
 @shared_task
 def cleanup_old_articles():
     """Nettoie les anciens articles lus"""
@@ -4,6 +4,8 @@ from typing import Optional
 from datetime import datetime
 import re
 
+COULEUR_PATTERN = re.compile(r'^#[0-9A-Fa-f]{6}$')
+
 class CategoryCreateDTO(BaseModel):
     """DTO pour créer une catégorie"""
     nom: str = Field(..., min_length=1, max_length=100)
@@ -11,7 +13,7 @@ class CategoryCreateDTO(BaseModel):
     
     @validator('couleur')
     def validate_color(cls, v):
-        if not re.match(r'^#[0-9A-Fa-f]{6}$', v):
+        if not COULEUR_PATTERN.match(v):
             raise ValueError('Format de couleur invalide (utilisez #RRGGBB)')
         return v
 
@@ -22,7 +24,7 @@ class CategoryUpdateDTO(BaseModel):
     
     @validator('couleur')
     def validate_color(cls, v):
-        if v is not None and not re.match(r'^#[0-9A-Fa-f]{6}$', v):
+        if v is not None and not COULEUR_PATTERN.match(v):
             raise ValueError('Format de couleur invalide (utilisez #RRGGBB)')
         return v
 
@@ -14,10 +14,10 @@ class PaginationParamsDTO(BaseModel):
 class PaginatedResponseDTO(BaseModel, Generic[T]):
     """DTO générique pour les réponses paginées"""
     items: List[T]
-    total: int
+    total: Optional[int] = None  # None en pagination par curseur
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
     has_next: bool
     has_previous: bool
     
@@ -63,6 +63,9 @@ class ArticleFilterDTO(BaseModel):
     date_fin: Optional[datetime] = None
     limit: int = Field(default=50, ge=1, le=200)
     offset: int = Field(default=0, ge=0)
+    # Curseur (publie_le, id) du dernier article reçu : remplace offset
+    before_date: Optional[datetime] = None
+    before_id: Optional[int] = None
 
 class ArticleBulkActionDTO(BaseModel):
     """DTO pour les actions en masse sur les articles"""
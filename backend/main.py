@@ -1,5 +1,6 @@
 # main_minimal.py - Version ultra minimale pour tester
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from routers import search_router, user_router, rss_router, category_router, collection_router, interaction_router
 
@@ -7,7 +8,9 @@ app = FastAPI(
     title="SUPRSS API - Test",
     description="API de gestion de flux RSS avec partage et collaboration",
     version="1.0.0",
-    docs_url="/api/docs"
+    docs_url="/api/docs",
+    # Sérialisation JSON des réponses en C (orjson)
+    default_response_class=ORJSONResponse
 )
 
 # CORS pour accepter toutes les origines
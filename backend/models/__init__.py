@@ -21,7 +21,7 @@ from .interaction import (
 from .import_export import JournalImport, JournalExport
 
 # Vues SQL
-from .views import t_vue_articles_utilisateur, t_vue_collections_detaillees
+from .views import t_vue_articles_utilisateur, t_vue_collections_detaillees, t_vue_activite_recente
 
 __all__ = [
     'Utilisateur',
@@ -39,5 +39,6 @@ __all__ = [
     'JournalImport',
     'JournalExport',
     't_vue_articles_utilisateur',
-    't_vue_collections_detaillees'
+    't_vue_collections_detaillees',
+    't_vue_activite_recente'
 ]
\ No newline at end of file
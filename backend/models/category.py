@@ -10,7 +10,8 @@ class Categorie(Base):
         ForeignKeyConstraint(['utilisateur_id'], ['utilisateur.id'], ondelete='CASCADE', name='fk_categorie_utilisateur'),
         PrimaryKeyConstraint('id', name='categorie_pkey'),
         UniqueConstraint('nom', 'utilisateur_id', name='unique_categorie_par_utilisateur'),
-        Index('idx_categorie_utilisateur', 'utilisateur_id')
+        # (utilisateur_id, id) : filtre « catégories de l'utilisateur » en index-only scan
+        Index('idx_categorie_utilisateur', 'utilisateur_id', 'id')
     )
 
     id = Column(Integer, primary_key=True)
@@ -29,8 +30,8 @@ class FluxCategorie(Base):
         ForeignKeyConstraint(['flux_id'], ['flux_rss.id'], ondelete='CASCADE', name='fk_flux_categorie_flux'),
         PrimaryKeyConstraint('id', name='flux_categorie_pkey'),
         UniqueConstraint('flux_id', 'categorie_id', name='unique_flux_categorie'),
-        Index('idx_flux_categorie_categorie', 'categorie_id'),
-        Index('idx_flux_categorie_flux', 'flux_id')
+        # Accès par flux_id : couvert par unique_flux_categorie (flux_id, categorie_id)
+        Index('idx_flux_categorie_categorie', 'categorie_id', 'flux_id')
     )
 
     id = Column(Integer, primary_key=True)
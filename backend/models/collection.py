@@ -11,6 +11,8 @@ class Collection(Base):
         ForeignKeyConstraint(['proprietaire_id'], ['utilisateur.id'], ondelete='CASCADE', name='fk_collection_proprietaire'),
         PrimaryKeyConstraint('id', name='collection_pkey'),
         Index('idx_collection_nom', 'nom'),
+        Index('idx_collection_nom_trgm', 'nom', postgresql_using='gin', postgresql_ops={'nom': 'gin_trgm_ops'}),
+        Index('idx_collection_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
         Index('idx_collection_proprietaire', 'proprietaire_id'),
         {'comment': 'Collections de flux RSS (personnelles ou partagées)'}
     )
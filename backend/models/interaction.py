@@ -1,5 +1,5 @@
 from typing import List, Optional
-from sqlalchemy import Boolean, Column, DateTime, ForeignKeyConstraint, Integer, Text, UniqueConstraint, Index, text, PrimaryKeyConstraint
+from sqlalchemy import Boolean, Column, Computed, DateTime, ForeignKeyConstraint, Integer, Text, UniqueConstraint, Index, text, PrimaryKeyConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -18,6 +18,12 @@ class CommentaireArticle(Base):
         Index('idx_commentaire_cree_le', 'cree_le'),
         Index('idx_commentaire_parent', 'commentaire_parent_id'),
         Index('idx_commentaire_utilisateur', 'utilisateur_id'),
+        Index('idx_commentaire_contenu_trgm', 'contenu', postgresql_using='gin', postgresql_ops={'contenu': 'gin_trgm_ops'}),
+        Index(
+            'idx_commentaire_article_collection_parent_cree_le',
+            'article_id', 'collection_id', 'commentaire_parent_id', 'cree_le',
+            postgresql_include=['utilisateur_id', 'modifie_le', 'est_modifie']
+        ),
         {'comment': 'Commentaires sur les articles dans les collections partagées'}
     )
 
@@ -29,6 +35,7 @@ class CommentaireArticle(Base):
     commentaire_parent_id = Column(Integer)
     cree_le = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
     modifie_le = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
+    est_modifie = Column(Boolean, Computed('COALESCE(modifie_le > cree_le, false)', persisted=True))
 
     article = relationship('Article', back_populates='commentaire_article')
     collection = relationship('Collection', back_populates='commentaire_article')
@@ -55,11 +62,22 @@ class MessageCollection(Base):
     contenu = Column(Text, nullable=False)
     cree_le = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
     modifie_le = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
+    est_modifie = Column(Boolean, Computed('COALESCE(modifie_le > cree_le, false)', persisted=True))
 
     collection = relationship('Collection', back_populates='message_collection')
     utilisateur = relationship('Utilisateur', back_populates='message_collection')
 
 
+# Index déclaré hors de la classe pour l'ordre décroissant de ses colonnes
+# (curseur (cree_le, id) de get_collection_messages)
+Index(
+    'idx_message_collection_cree_le',
+    MessageCollection.collection_id,
+    MessageCollection.cree_le.desc(),
+    MessageCollection.id.desc()
+)
+
+
 class StatutUtilisateurArticle(Base):
     __tablename__ = 'statut_utilisateur_article'
     __table_args__ = (
@@ -70,7 +88,9 @@ class StatutUtilisateurArticle(Base):
         Index('idx_statut_article', 'article_id'),
         Index('idx_statut_est_favori', 'est_favori'),
         Index('idx_statut_est_lu', 'est_lu'),
-        Index('idx_statut_utilisateur', 'utilisateur_id'),
+        Index('idx_statut_utilisateur', 'utilisateur_id', 'article_id', postgresql_include=['est_lu', 'est_favori']),
+        Index('idx_statut_utilisateur_article_lu', 'utilisateur_id', 'article_id', postgresql_where=text('est_lu = true')),
+        Index('idx_statut_utilisateur_article_favori', 'utilisateur_id', 'article_id', postgresql_where=text('est_favori = true')),
         {'comment': 'Statut de lecture et favoris par utilisateur'}
     )
 
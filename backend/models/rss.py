@@ -1,5 +1,6 @@
-from sqlalchemy import Boolean, CheckConstraint, Column, DateTime, ForeignKeyConstraint, Integer, String, Text, UniqueConstraint, Index, text, PrimaryKeyConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, CheckConstraint, Column, Computed, DateTime, ForeignKeyConstraint, Integer, String, Text, UniqueConstraint, Index, text, PrimaryKeyConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -13,6 +14,9 @@ class FluxRss(Base):
         Index('idx_flux_rss_actif', 'est_actif'),
         Index('idx_flux_rss_derniere_maj', 'derniere_maj'),
         Index('idx_flux_rss_url', 'url'),
+        Index('idx_flux_rss_nom_trgm', 'nom', postgresql_using='gin', postgresql_ops={'nom': 'gin_trgm_ops'}),
+        Index('idx_flux_rss_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+        Index('idx_flux_rss_url_trgm', 'url', postgresql_using='gin', postgresql_ops={'url': 'gin_trgm_ops'}),
         {'comment': "Flux RSS configurés dans l'application"}
     )
 
@@ -23,6 +27,8 @@ class FluxRss(Base):
     frequence_maj_heures = Column(Integer, server_default=text('24'))
     est_actif = Column(Boolean, server_default=text('true'))
     derniere_maj = Column(DateTime)
+    etag = Column(Text)
+    last_modified = Column(Text)
     cree_le = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
     modifie_le = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
 
@@ -36,11 +42,11 @@ class Article(Base):
         ForeignKeyConstraint(['flux_id'], ['flux_rss.id'], ondelete='CASCADE', name='fk_article_flux'),
         PrimaryKeyConstraint('id', name='article_pkey'),
         UniqueConstraint('guid', 'flux_id', name='unique_guid_par_flux'),
-        Index('idx_article_contenu'),
-        Index('idx_article_flux', 'flux_id'),
+        Index('idx_article_flux_publie_le', 'flux_id', 'publie_le', 'id'),
         Index('idx_article_guid', 'guid'),
         Index('idx_article_publie_le', 'publie_le'),
-        Index('idx_article_titre'),
+        Index('idx_article_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('idx_article_titre_trgm', 'titre', postgresql_using='gin', postgresql_ops={'titre': 'gin_trgm_ops'}),
         {'comment': 'Articles récupérés depuis les flux RSS'}
     )
 
@@ -55,6 +61,14 @@ class Article(Base):
     publie_le = Column(DateTime)
     recupere_le = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
     modifie_le = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
+    # Vecteur de recherche plein texte, maintenu par PostgreSQL
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('french', coalesce(titre, '')), 'A') || "
+        "setweight(to_tsvector('french', coalesce(auteur, '')), 'B') || "
+        "setweight(to_tsvector('french', coalesce(resume, '')), 'B') || "
+        "setweight(to_tsvector('french', coalesce(contenu, '')), 'C')",
+        persisted=True
+    )))
 
     flux = relationship('FluxRss', back_populates='article')
     commentaire_article = relationship('CommentaireArticle', back_populates='article')
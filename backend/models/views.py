@@ -30,4 +30,15 @@ t_vue_collections_detaillees = Table(
     Column('proprietaire', String(50)),
     Column('nombre_flux', BigInteger),
     Column('nombre_membres', BigInteger)
-)
\ No newline at end of file
+)
+
+t_vue_activite_recente = Table(
+    'vue_activite_recente', Base.metadata,
+    Column('type', String(10)),
+    Column('id', Integer),
+    Column('contenu_extrait', Text),
+    Column('utilisateur', String(50)),
+    Column('collection_id', Integer),
+    Column('article_id', Integer),
+    Column('cree_le', DateTime)
+)
@@ -217,6 +217,8 @@ async def send_message(
 async def get_collection_messages(
     collection_id: int,
     pagination: PaginationParamsDTO = Depends(),
+    before: Optional[datetime] = Query(None),
+    before_id: Optional[int] = Query(None),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -232,13 +234,17 @@ async def get_collection_messages(
         )
     
     # Récupérer les messages
-    messages, total = interaction_business.get_collection_messages(
+    messages, total, has_more = interaction_business.get_collection_messages(
         collection_id=collection_id,
         page=pagination.page,
-        page_size=pagination.page_size
+        page_size=pagination.page_size,
+        before=before,
+        before_id=before_id
     )
     
-    total_pages = (total + pagination.page_size - 1) // pagination.page_size
+    total_pages = None
+    if total is not None:
+        total_pages = (total + pagination.page_size - 1) // pagination.page_size
     
     return PaginatedResponseDTO(
         items=messages,
@@ -246,8 +252,8 @@ async def get_collection_messages(
         page=pagination.page,
         page_size=pagination.page_size,
         total_pages=total_pages,
-        has_next=pagination.page < total_pages,
-        has_previous=pagination.page > 1
+        has_next=has_more,
+        has_previous=pagination.page > 1 or before_id is not None
     )
 
 
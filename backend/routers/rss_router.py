@@ -1,9 +1,10 @@
 # routers/rss_router.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from fastapi.responses import PlainTextResponse
 from typing import List, Optional
 from datetime import datetime
+import logging
 
 from dtos.rss_dto import (
     FluxCreateDTO,
@@ -18,13 +19,26 @@ from dtos.pagination_dto import PaginationParamsDTO, PaginatedResponseDTO
 from business.rss_business import RssBusiness
 from routers.user_router import get_current_user
 from core.database import get_db
+from core.tasks import update_single_feed, update_user_feeds
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/rss", tags=["Flux RSS"])
 
+def _dispatch_task(task, *args):
+    """
+    Envoie une tâche aux workers Celery. Broker indisponible : l'erreur est
+    journalisée sans faire échouer la requête (la planification beat
+    reprendra la mise à jour).
+    """
+    try:
+        task.delay(*args)
+    except Exception as e:
+        logger.error(f"Envoi de la tâche {task.name}{args} impossible: {e}")
+
 @router.post("/flux", response_model=FluxResponseDTO, status_code=status.HTTP_201_CREATED)
-async def create_flux(
+def create_flux(
     flux_data: FluxCreateDTO,
-    background_tasks: BackgroundTasks,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -44,11 +58,8 @@ async def create_flux(
         flux_data=flux_data
     )
     
-    # Lancer la récupération des articles en arrière-plan
-    background_tasks.add_task(
-        rss_business.fetch_flux_articles,
-        flux.id
-    )
+    # Lancer la récupération des articles dans un worker Celery
+    _dispatch_task(update_single_feed, flux.id)
     
     return flux
 
@@ -136,9 +147,8 @@ async def delete_flux(
     return None
 
 @router.post("/flux/{flux_id}/refresh", status_code=status.HTTP_202_ACCEPTED)
-async def refresh_flux(
+def refresh_flux(
     flux_id: int,
-    background_tasks: BackgroundTasks,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -159,11 +169,8 @@ async def refresh_flux(
             detail="Veuillez attendre avant de rafraîchir ce flux"
         )
     
-    # Lancer la mise à jour en arrière-plan
-    background_tasks.add_task(
-        rss_business.fetch_flux_articles,
-        flux_id
-    )
+    # Lancer la mise à jour dans un worker Celery
+    _dispatch_task(update_single_feed, flux_id)
     
     return {"message": "Mise à jour en cours"}
 
@@ -190,6 +197,8 @@ async def get_articles(
     search_query: Optional[str] = Query(None),
     date_debut: Optional[datetime] = Query(None),
     date_fin: Optional[datetime] = Query(None),
+    before_date: Optional[datetime] = Query(None),
+    before_id: Optional[int] = Query(None),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -206,11 +215,13 @@ async def get_articles(
         date_debut=date_debut,
         date_fin=date_fin,
         limit=pagination.page_size,
-        offset=(pagination.page - 1) * pagination.page_size
+        offset=(pagination.page - 1) * pagination.page_size,
+        before_date=before_date,
+        before_id=before_id
     )
     
     # Récupérer les articles
-    articles, total = rss_business.get_user_articles(
+    articles, total, has_more = rss_business.get_user_articles(
         user_id=current_user.id,
         filters=filter_dto,
         sort_by=pagination.sort_by,
@@ -218,7 +229,9 @@ async def get_articles(
     )
     
     # Calculer les métadonnées de pagination
-    total_pages = (total + pagination.page_size - 1) // pagination.page_size
+    total_pages = None
+    if total is not None:
+        total_pages = (total + pagination.page_size - 1) // pagination.page_size
     
     return PaginatedResponseDTO(
         items=articles,
@@ -226,8 +239,8 @@ async def get_articles(
         page=pagination.page,
         page_size=pagination.page_size,
         total_pages=total_pages,
-        has_next=pagination.page < total_pages,
-        has_previous=pagination.page > 1
+        has_next=has_more,
+        has_previous=pagination.page > 1 or before_id is not None
     )
 
 @router.get("/articles/{article_id}", response_model=ArticleResponseDTO)
@@ -302,9 +315,12 @@ async def bulk_article_action(
     """Effectue une action en masse sur plusieurs articles"""
     rss_business = RssBusiness(db)
     
-    # Vérifier l'accès à tous les articles
+    # Vérifier l'accès à tous les articles en une seule requête
+    readable_ids = rss_business.get_readable_article_ids(
+        current_user.id, bulk_action.article_ids
+    )
     for article_id in bulk_action.article_ids:
-        if not rss_business.user_can_read_article(current_user.id, article_id):
+        if article_id not in readable_ids:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Vous n'avez pas accès à l'article {article_id}"
@@ -359,9 +375,8 @@ async def get_unread_count(
     return {"unread_count": count}
 
 @router.post("/flux/import-opml", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def import_opml(
+def import_opml(
     opml_file: bytes,
-    background_tasks: BackgroundTasks,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -374,11 +389,8 @@ async def import_opml(
             opml_content=opml_file
         )
         
-        # Lancer la récupération des articles en arrière-plan
-        background_tasks.add_task(
-            rss_business.fetch_all_user_flux_articles,
-            current_user.id
-        )
+        # Lancer la récupération des articles dans un worker Celery
+        _dispatch_task(update_user_feeds, current_user.id)
         
         return {
             "message": f"{imported_count} flux importés avec succès",
@@ -391,7 +403,7 @@ async def import_opml(
         )
 
 @router.get("/flux/export-opml", response_class=PlainTextResponse)
-async def export_opml(
+def export_opml(
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1,7 +1,10 @@
 # routers/search_router.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
+import asyncio
+from datetime import datetime
 
 from dtos.search_dto import (
     GlobalSearchDTO,
@@ -9,22 +12,40 @@ from dtos.search_dto import (
 )
 from business.search_business import SearchBusiness
 from routers.user_router import get_current_user
-from core.database import get_db
+from core.database import SessionLocal, get_db
 
 router = APIRouter(prefix="/api/search", tags=["Recherche"])
 
+# Recherches de la recherche globale, par type de résultat
+GLOBAL_SEARCH_METHODS = {
+    "articles": SearchBusiness.search_articles,
+    "flux": SearchBusiness.search_flux,
+    "collections": SearchBusiness.search_collections,
+    "comments": SearchBusiness.search_comments,
+}
+
+def _search_in_own_session(
+    search_method: Callable[..., List[SearchResultDTO]],
+    user_id: int,
+    query: str,
+    limit: int
+) -> List[SearchResultDTO]:
+    """Exécute une recherche sur sa propre session (une connexion du pool par thread)"""
+    db = SessionLocal()
+    try:
+        return search_method(SearchBusiness(db), user_id=user_id, query=query, limit=limit)
+    finally:
+        db.close()
+
 @router.post("/global", response_model=Dict[str, List[SearchResultDTO]])
 async def global_search(
     search_data: GlobalSearchDTO,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user)
 ):
     """
     Effectue une recherche globale dans l'application.
     Retourne les résultats groupés par type (articles, flux, collections, commentaires).
     """
-    search_business = SearchBusiness(db)
-    
     # Valider la requête de recherche
     if len(search_data.query.strip()) < 2:
         raise HTTPException(
@@ -32,45 +53,21 @@ async def global_search(
             detail="La requête de recherche doit contenir au moins 2 caractères"
         )
     
-    results = {}
-    
-    # Rechercher dans les articles
-    if "articles" in search_data.search_in:
-        articles = search_business.search_articles(
-            user_id=current_user.id,
-            query=search_data.query,
-            limit=search_data.limit_per_type
-        )
-        results["articles"] = articles
-    
-    # Rechercher dans les flux
-    if "flux" in search_data.search_in:
-        flux = search_business.search_flux(
-            user_id=current_user.id,
-            query=search_data.query,
-            limit=search_data.limit_per_type
-        )
-        results["flux"] = flux
-    
-    # Rechercher dans les collections
-    if "collections" in search_data.search_in:
-        collections = search_business.search_collections(
-            user_id=current_user.id,
-            query=search_data.query,
-            limit=search_data.limit_per_type
+    # Les recherches demandées sont indépendantes : elles s'exécutent en
+    # parallèle, chacune dans un thread avec sa propre session
+    search_types = [t for t in GLOBAL_SEARCH_METHODS if t in search_data.search_in]
+    found = await asyncio.gather(*(
+        run_in_threadpool(
+            _search_in_own_session,
+            GLOBAL_SEARCH_METHODS[search_type],
+            current_user.id,
+            search_data.query,
+            search_data.limit_per_type
         )
-        results["collections"] = collections
-    
-    # Rechercher dans les commentaires
-    if "comments" in search_data.search_in:
-        comments = search_business.search_comments(
-            user_id=current_user.id,
-            query=search_data.query,
-            limit=search_data.limit_per_type
-        )
-        results["comments"] = comments
+        for search_type in search_types
+    ))
     
-    return results
+    return dict(zip(search_types, found))
 
 @router.get("/articles", response_model=List[SearchResultDTO])
 async def search_articles(
@@ -83,10 +80,22 @@ async def search_articles(
     only_favorites: bool = False,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    before_date: Optional[datetime] = Query(None),
+    before_id: Optional[int] = Query(None),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Recherche avancée dans les articles avec filtres"""
+    """
+    Recherche avancée dans les articles avec filtres.
+    Pagination par curseur : before_date et before_id (publie_le et id du
+    dernier résultat reçu) vont ensemble et remplacent offset.
+    """
+    if (before_date is None) != (before_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="before_date et before_id doivent être fournis ensemble"
+        )
+    
     search_business = SearchBusiness(db)
     
     results = search_business.search_articles_advanced(
@@ -99,7 +108,9 @@ async def search_articles(
         only_unread=only_unread,
         only_favorites=only_favorites,
         limit=limit,
-        offset=offset
+        offset=offset,
+        before_date=before_date,
+        before_id=before_id
     )
     
     return results
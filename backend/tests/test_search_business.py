@@ -0,0 +1,55 @@
+# tests/test_search_business.py
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from business.search_business import SearchBusiness
+from core.config import settings
+
+
+@pytest.fixture
+def executed_queries(monkeypatch):
+    """Capture les requêtes exécutées par Query.all (sans base de données)"""
+    queries = []
+
+    def fake_all(query):
+        queries.append(query)
+        return []
+
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+    monkeypatch.setattr(Query, "all", fake_all)
+    return queries
+
+
+def _compile(query: Query) -> str:
+    return str(query.statement.compile(dialect=postgresql.dialect()))
+
+
+def test_search_articles_advanced_offset_pagination(executed_queries):
+    """Sans curseur, la recherche avancée pagine par OFFSET après le tri"""
+    SearchBusiness(Session()).search_articles_advanced(
+        user_id=1, query="python", limit=20, offset=40
+    )
+
+    # Une erreur de construction de la requête serait avalée par la méthode
+    assert len(executed_queries) == 1
+    sql = _compile(executed_queries[0])
+    assert "ORDER BY article.publie_le DESC, article.id DESC" in sql
+    assert "OFFSET" in sql
+
+
+def test_search_articles_advanced_cursor_pagination(executed_queries):
+    """Avec before_date et before_id, la recherche pagine par curseur sans OFFSET"""
+    SearchBusiness(Session()).search_articles_advanced(
+        user_id=1,
+        query="python",
+        before_date=datetime(2024, 1, 1),
+        before_id=10
+    )
+
+    assert len(executed_queries) == 1
+    sql = _compile(executed_queries[0])
+    assert "(article.publie_le, article.id) <" in sql
+    assert "OFFSET" not in sql
@@ -9,6 +9,7 @@
 -- Extensions utiles
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- =====================================================
 -- TYPES ÉNUMÉRÉS
@@ -124,6 +125,9 @@ CREATE TABLE collection (
 -- Index pour optimisation
 CREATE INDEX idx_collection_proprietaire ON collection(proprietaire_id);
 CREATE INDEX idx_collection_nom ON collection(nom);
+-- Recherche ILIKE '%terme%'
+CREATE INDEX idx_collection_nom_trgm ON collection USING gin(nom gin_trgm_ops);
+CREATE INDEX idx_collection_description_trgm ON collection USING gin(description gin_trgm_ops);
 
 -- =====================================================
 -- TABLE FLUX_RSS
@@ -137,6 +141,8 @@ CREATE TABLE flux_rss (
     frequence_maj_heures INTEGER DEFAULT 24 CHECK (frequence_maj_heures > 0),
     est_actif BOOLEAN DEFAULT TRUE,
     derniere_maj TIMESTAMP,
+    etag TEXT, -- Validateurs HTTP de la dernière récupération
+    last_modified TEXT,
     cree_le TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     modifie_le TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -145,6 +151,10 @@ CREATE TABLE flux_rss (
 CREATE INDEX idx_flux_rss_url ON flux_rss(url);
 CREATE INDEX idx_flux_rss_actif ON flux_rss(est_actif);
 CREATE INDEX idx_flux_rss_derniere_maj ON flux_rss(derniere_maj);
+-- Recherche ILIKE '%terme%'
+CREATE INDEX idx_flux_rss_nom_trgm ON flux_rss USING gin(nom gin_trgm_ops);
+CREATE INDEX idx_flux_rss_description_trgm ON flux_rss USING gin(description gin_trgm_ops);
+CREATE INDEX idx_flux_rss_url_trgm ON flux_rss USING gin(url gin_trgm_ops);
 
 -- =====================================================
 -- TABLE CATEGORIE
@@ -165,7 +175,7 @@ CREATE TABLE categorie (
 );
 
 -- Index pour optimisation
-CREATE INDEX idx_categorie_utilisateur ON categorie(utilisateur_id);
+CREATE INDEX idx_categorie_utilisateur ON categorie(utilisateur_id, id);
 
 -- =====================================================
 -- TABLE ARTICLE
@@ -183,6 +193,12 @@ CREATE TABLE article (
     publie_le TIMESTAMP,
     recupere_le TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     modifie_le TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('french', coalesce(titre, '')), 'A') ||
+        setweight(to_tsvector('french', coalesce(auteur, '')), 'B') ||
+        setweight(to_tsvector('french', coalesce(resume, '')), 'B') ||
+        setweight(to_tsvector('french', coalesce(contenu, '')), 'C')
+    ) STORED,
     
     CONSTRAINT fk_article_flux 
         FOREIGN KEY (flux_id) REFERENCES flux_rss(id) 
@@ -192,11 +208,12 @@ CREATE TABLE article (
 );
 
 -- Index pour optimisation des requêtes
-CREATE INDEX idx_article_flux ON article(flux_id);
+CREATE INDEX idx_article_flux_publie_le ON article(flux_id, publie_le DESC, id DESC);
 CREATE INDEX idx_article_publie_le ON article(publie_le DESC);
-CREATE INDEX idx_article_titre ON article USING gin(to_tsvector('french', titre));
-CREATE INDEX idx_article_contenu ON article USING gin(to_tsvector('french', contenu));
+CREATE INDEX idx_article_search_vector ON article USING gin(search_vector);
 CREATE INDEX idx_article_guid ON article(guid);
+-- Suggestions ILIKE 'préfixe%' sur les titres
+CREATE INDEX idx_article_titre_trgm ON article USING gin(titre gin_trgm_ops);
 
 -- =====================================================
 -- TABLE MEMBRE_COLLECTION
@@ -276,8 +293,8 @@ CREATE TABLE flux_categorie (
 );
 
 -- Index pour optimisation
-CREATE INDEX idx_flux_categorie_flux ON flux_categorie(flux_id);
-CREATE INDEX idx_flux_categorie_categorie ON flux_categorie(categorie_id);
+-- Accès par flux_id : couvert par unique_flux_categorie (flux_id, categorie_id)
+CREATE INDEX idx_flux_categorie_categorie ON flux_categorie(categorie_id, flux_id);
 
 -- =====================================================
 -- TABLE STATUT_UTILISATEUR_ARTICLE
@@ -303,10 +320,14 @@ CREATE TABLE statut_utilisateur_article (
 );
 
 -- Index pour optimisation
-CREATE INDEX idx_statut_utilisateur ON statut_utilisateur_article(utilisateur_id);
+CREATE INDEX idx_statut_utilisateur ON statut_utilisateur_article(utilisateur_id, article_id) INCLUDE (est_lu, est_favori);
 CREATE INDEX idx_statut_article ON statut_utilisateur_article(article_id);
 CREATE INDEX idx_statut_est_lu ON statut_utilisateur_article(est_lu);
 CREATE INDEX idx_statut_est_favori ON statut_utilisateur_article(est_favori);
+-- Anti-jointure du compteur de non lus
+CREATE INDEX idx_statut_utilisateur_article_lu ON statut_utilisateur_article(utilisateur_id, article_id) WHERE est_lu = TRUE;
+-- Liste des favoris
+CREATE INDEX idx_statut_utilisateur_article_favori ON statut_utilisateur_article(utilisateur_id, article_id) WHERE est_favori = TRUE;
 
 -- =====================================================
 -- TABLE COMMENTAIRE_ARTICLE
@@ -321,6 +342,7 @@ CREATE TABLE commentaire_article (
     commentaire_parent_id INTEGER,
     cree_le TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     modifie_le TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    est_modifie BOOLEAN GENERATED ALWAYS AS (COALESCE(modifie_le > cree_le, FALSE)) STORED,
     
     CONSTRAINT fk_commentaire_article 
         FOREIGN KEY (article_id) REFERENCES article(id) 
@@ -342,6 +364,12 @@ CREATE INDEX idx_commentaire_utilisateur ON commentaire_article(utilisateur_id);
 CREATE INDEX idx_commentaire_collection ON commentaire_article(collection_id);
 CREATE INDEX idx_commentaire_parent ON commentaire_article(commentaire_parent_id);
 CREATE INDEX idx_commentaire_cree_le ON commentaire_article(cree_le DESC);
+-- Recherche ILIKE '%terme%'
+CREATE INDEX idx_commentaire_contenu_trgm ON commentaire_article USING gin(contenu gin_trgm_ops);
+-- Index couvrant pour le fil de commentaires d'un article (lecture index-only)
+CREATE INDEX idx_commentaire_article_collection_parent_cree_le
+    ON commentaire_article(article_id, collection_id, commentaire_parent_id, cree_le)
+    INCLUDE (utilisateur_id, modifie_le, est_modifie);
 
 -- =====================================================
 -- TABLE MESSAGE_COLLECTION
@@ -354,6 +382,7 @@ CREATE TABLE message_collection (
     contenu TEXT NOT NULL,
     cree_le TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     modifie_le TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    est_modifie BOOLEAN GENERATED ALWAYS AS (COALESCE(modifie_le > cree_le, FALSE)) STORED,
     
     CONSTRAINT fk_message_collection 
         FOREIGN KEY (collection_id) REFERENCES collection(id) 
@@ -367,6 +396,7 @@ CREATE TABLE message_collection (
 CREATE INDEX idx_message_collection ON message_collection(collection_id);
 CREATE INDEX idx_message_utilisateur ON message_collection(utilisateur_id);
 CREATE INDEX idx_message_cree_le ON message_collection(cree_le DESC);
+CREATE INDEX idx_message_collection_cree_le ON message_collection(collection_id, cree_le DESC, id DESC);
 
 -- =====================================================
 -- TABLE JOURNAL_EXPORT
@@ -523,6 +553,30 @@ LEFT JOIN collection_flux cf ON c.id = cf.collection_id
 LEFT JOIN membre_collection mc ON c.id = mc.collection_id
 GROUP BY c.id, c.nom, c.description, c.est_partagee, c.cree_le, u.nom_utilisateur;
 
+-- Vue pour l'activité récente (commentaires et messages) avec extrait du contenu
+CREATE VIEW vue_activite_recente AS
+SELECT 
+    'comment'::VARCHAR(10) as type,
+    c.id,
+    CASE WHEN char_length(c.contenu) > 100 THEN left(c.contenu, 100) || '...' ELSE c.contenu END as contenu_extrait,
+    u.nom_utilisateur as utilisateur,
+    c.collection_id,
+    c.article_id,
+    c.cree_le
+FROM commentaire_article c
+JOIN utilisateur u ON c.utilisateur_id = u.id
+UNION ALL
+SELECT 
+    'message'::VARCHAR(10) as type,
+    m.id,
+    CASE WHEN char_length(m.contenu) > 100 THEN left(m.contenu, 100) || '...' ELSE m.contenu END as contenu_extrait,
+    u.nom_utilisateur as utilisateur,
+    m.collection_id,
+    NULL::INTEGER as article_id,
+    m.cree_le
+FROM message_collection m
+JOIN utilisateur u ON m.utilisateur_id = u.id;
+
 -- =====================================================
 -- COMMENTAIRES SUR LES TABLES
 -- =====================================================